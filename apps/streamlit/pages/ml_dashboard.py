@@ -32,12 +32,17 @@ from shared.config import get_config
 config = get_config()
 
 
+def _null_metrics_to_nan(metrics: dict) -> dict:
+    """Read undefined metrics, stored as null (e.g. MAPE on zero demand), as NaN."""
+    return {k: float('nan') if v is None else v for k, v in metrics.items()}
+
+
 def load_model_results():
     """Load model training results."""
     results_path = project_root / "data" / "processed" / "lightgbm_results" / "lightgbm_results.json"
     if results_path.exists():
         with open(results_path, 'r') as f:
-            return json.load(f)
+            return json.load(f, object_hook=_null_metrics_to_nan)
     return None
 
 
@@ -46,7 +51,7 @@ def load_baseline_results():
     results_path = project_root / "data" / "processed" / "baseline_results" / "baseline_model_results.json"
     if results_path.exists():
         with open(results_path, 'r') as f:
-            return json.load(f)
+            return json.load(f, object_hook=_null_metrics_to_nan)
     return None
 
 
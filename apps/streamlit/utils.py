@@ -8,6 +8,7 @@ import streamlit as st
 
 from shared.config import get_config
 from shared.column_mappings import COLUMN_MAPPINGS
+from shared.mvp_loader import load_mvp_stores
 from shared.logging_setup import get_logger
 from services.ingestion.datasets import load_freshretailnet_dataset
 from services.forecasting.features.aggregate_daily import aggregate_to_daily
@@ -36,23 +37,7 @@ def load_mvp_data() -> Tuple[pd.DataFrame, dict]:
         category_col = COLUMN_MAPPINGS.get('category_col', 'first_category_id')
         
         # Load MVP stores
-        mvp_file = Path(config.data.processed_path) / "mvp_selection" / "mvp_subset.txt"
-        stores = []
-        if mvp_file.exists():
-            with open(mvp_file, 'r') as f:
-                lines = f.readlines()
-            in_stores_section = False
-            for line in lines:
-                if "Selected Stores" in line:
-                    in_stores_section = True
-                    continue
-                if in_stores_section and line.strip() and not line.strip().startswith("Selected SKUs"):
-                    try:
-                        stores.append(int(line.strip()))
-                    except ValueError:
-                        pass
-                if "Selected SKUs" in line:
-                    break
+        stores = load_mvp_stores()
         
         if stores:
             df = df[df[store_col].isin(stores)].copy()
@@ -155,7 +140,8 @@ def load_lightgbm_results() -> Optional[dict]:
         try:
             import json
             with open(results_path, 'r') as f:
-                return json.load(f)
+                # Undefined metrics (e.g. MAPE on zero demand) are stored as null
+                return {k: float('nan') if v is None else v for k, v in json.load(f).items()}
         except Exception as e:
             logger.error(f"Error loading LightGBM results: {e}")
             return None
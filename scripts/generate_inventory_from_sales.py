@@ -9,6 +9,7 @@ import sys
 from pathlib import Path
 from datetime import date, timedelta
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 # Add project root to path
@@ -37,6 +38,8 @@ class InventoryGenerator:
         self.safety_factor = safety_factor
         self.df: Optional[pd.DataFrame] = None
         self.cols: Dict[str, str] = {}
+        self._daily_demand_cache: Dict[Tuple[int, int], float] = {}
+        self._rng = np.random.default_rng()
         self._load_data()
     
     def _load_data(self):
@@ -112,6 +115,9 @@ class InventoryGenerator:
     def calculate_daily_demand(self, store_id: int, product_id: int) -> float:
         """Calculate average daily demand for a product at a store.
         
+        Results are memoized per (store_id, product_id), since inventory and
+        forecast seeding ask for the same products.
+        
         Args:
             store_id: Store ID
             product_id: Product ID
@@ -119,6 +125,13 @@ class InventoryGenerator:
         Returns:
             Average daily sales quantity
         """
+        key = (store_id, product_id)
+        if key not in self._daily_demand_cache:
+            self._daily_demand_cache[key] = self._compute_daily_demand(store_id, product_id)
+        return self._daily_demand_cache[key]
+    
+    def _compute_daily_demand(self, store_id: int, product_id: int) -> float:
+        """Compute average daily demand from the sales data (uncached)."""
         store_col = self.cols['store']
         product_col = self.cols['product']
         date_col = self.cols['date']
@@ -144,7 +157,8 @@ class InventoryGenerator:
         product_id: int,
         category_id: int,
         avg_daily_demand: float,
-        reference_date: Optional[date] = None
+        reference_date: Optional[date] = None,
+        variations: Optional[Dict[str, float]] = None
     ) -> Dict:
         """Generate a single inventory snapshot for a product.
         
@@ -154,12 +168,16 @@ class InventoryGenerator:
             category_id: Category ID for shelf life lookup
             avg_daily_demand: Average daily demand
             reference_date: Date for the snapshot (defaults to today)
+            variations: Pre-drawn random factors (see _draw_variations);
+                drawn for this product if omitted
             
         Returns:
             Dict with inventory snapshot data
         """
         if reference_date is None:
             reference_date = date.today()
+        if variations is None:
+            variations = {key: values[0] for key, values in self._draw_variations(1).items()}
         
         shelf_life_days = get_shelf_life(category_id)
         
@@ -167,18 +185,16 @@ class InventoryGenerator:
         base_inventory = avg_daily_demand * self.coverage_days * self.safety_factor
         
         # Add some realistic variation (-10% to +10%)
-        import random
-        variation = random.uniform(0.9, 1.1)
-        total_quantity = max(10, round(base_inventory * variation))
+        total_quantity = max(10, round(base_inventory * variations['variation']))
         
         # Split between shelf and backroom (60-70% on shelf)
-        shelf_ratio = random.uniform(0.60, 0.70)
+        shelf_ratio = variations['shelf_ratio']
         shelf_quantity = round(total_quantity * shelf_ratio)
         backroom_quantity = total_quantity - shelf_quantity
         
         # Calculate days until expiry based on shelf life
         # Products have varying ages - use random portion of shelf life remaining
-        age_factor = random.uniform(0.3, 0.7)  # Product is 30-70% through its shelf life
+        age_factor = variations['age_factor']  # Product is 30-70% through its shelf life
         days_until_expiry = max(1, int(shelf_life_days * (1 - age_factor)))
         expiry_date = reference_date + timedelta(days=days_until_expiry)
         
@@ -191,13 +207,13 @@ class InventoryGenerator:
         )
         
         # In-transit (occasionally some stock coming)
-        in_transit = random.randint(0, 15) if random.random() > 0.7 else 0
+        in_transit = int(variations['in_transit'])
         
         # Items to discard (only if very close to expiry)
-        to_discard = random.randint(0, 3) if days_until_expiry <= 2 else 0
+        to_discard = int(variations['to_discard']) if days_until_expiry <= 2 else 0
         
         # Sold today (based on demand with some variation)
-        sold_today = max(0, int(avg_daily_demand * random.uniform(0.7, 1.3)))
+        sold_today = max(0, int(avg_daily_demand * variations['sold_factor']))
         
         return {
             'store_id': store_id,
@@ -219,6 +235,27 @@ class InventoryGenerator:
             'shelf_life_days': shelf_life_days,
         }
     
+    def _draw_variations(self, n: int) -> Dict[str, np.ndarray]:
+        """Draw the random snapshot factors for n products at once.
+        
+        Args:
+            n: Number of products
+            
+        Returns:
+            Dict of factor name to an array of n values
+        """
+        rng = self._rng
+        # In-transit stock arrives for roughly 30% of products
+        arriving = rng.random(n) > 0.7
+        return {
+            'variation': rng.uniform(0.9, 1.1, n),
+            'shelf_ratio': rng.uniform(0.60, 0.70, n),
+            'age_factor': rng.uniform(0.3, 0.7, n),
+            'in_transit': np.where(arriving, rng.integers(0, 16, n), 0),
+            'to_discard': rng.integers(0, 4, n),
+            'sold_factor': rng.uniform(0.7, 1.3, n),
+        }
+    
     def _derive_expiry_buckets(
         self, 
         total_quantity: int, 
@@ -281,20 +318,28 @@ class InventoryGenerator:
             reference_date = date.today()
         
         products = self.get_products_for_store(store_id, limit=max_products)
-        inventory = []
         
+        # Only include products with actual sales
+        selling = []
         for prod in products:
             avg_demand = self.calculate_daily_demand(store_id, prod['product_id'])
-            
-            if avg_demand > 0:  # Only include products with actual sales
-                snapshot = self.generate_inventory_snapshot(
-                    store_id=store_id,
-                    product_id=prod['product_id'],
-                    category_id=prod['category_id'],
-                    avg_daily_demand=avg_demand,
-                    reference_date=reference_date
-                )
-                inventory.append(snapshot)
+            if avg_demand > 0:
+                selling.append((prod, avg_demand))
+        
+        # Draw the random factors for all products in one pass
+        draws = self._draw_variations(len(selling))
+        inventory = []
+        
+        for i, (prod, avg_demand) in enumerate(selling):
+            snapshot = self.generate_inventory_snapshot(
+                store_id=store_id,
+                product_id=prod['product_id'],
+                category_id=prod['category_id'],
+                avg_daily_demand=avg_demand,
+                reference_date=reference_date,
+                variations={key: values[i] for key, values in draws.items()}
+            )
+            inventory.append(snapshot)
         
         logger.info(f"Generated {len(inventory)} inventory items for store {store_id}")
         return inventory
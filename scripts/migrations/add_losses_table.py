@@ -7,12 +7,42 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData,
+    String, Table, create_engine, func,
+)
 from shared.config import get_config
 from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+metadata = MetaData()
+
+# Referenced tables only need their primary keys so the foreign keys resolve
+Table("stores", metadata, Column("id", Integer, primary_key=True))
+Table("products", metadata, Column("id", Integer, primary_key=True))
+
+# Column types are dialect-neutral; SQLAlchemy emits the SQLite/PostgreSQL DDL
+losses = Table(
+    "losses",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("store_id", Integer, ForeignKey("stores.id"), nullable=False),
+    Column("product_id", Integer, ForeignKey("products.id")),
+    Column("loss_date", Date, nullable=False),
+    Column("loss_type", String(50), nullable=False),
+    Column("quantity", Float, nullable=False),
+    Column("cost", Float, nullable=False),
+    Column("revenue_lost", Float, nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+)
+
+indexes = [
+    Index("idx_losses_store_id", losses.c.store_id),
+    Index("idx_losses_product_id", losses.c.product_id),
+    Index("idx_losses_loss_date", losses.c.loss_date),
+]
+
 
 def migrate_database():
     """Create losses table."""
@@ -30,85 +60,16 @@ def migrate_database():
     )
     
     try:
-        with engine.connect() as conn:
-            if "sqlite" in database_url:
-                # SQLite syntax
-                result = conn.execute(text("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='losses'
-                """))
-                if result.fetchone():
-                    logger.info("losses table already exists")
-                    return True
-                
-                logger.info("Creating losses table...")
-                conn.execute(text("""
-                    CREATE TABLE losses (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        store_id INTEGER NOT NULL,
-                        product_id INTEGER,
-                        loss_date DATE NOT NULL,
-                        loss_type VARCHAR(50) NOT NULL,
-                        quantity REAL NOT NULL,
-                        cost REAL NOT NULL,
-                        revenue_lost REAL NOT NULL,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (store_id) REFERENCES stores(id),
-                        FOREIGN KEY (product_id) REFERENCES products(id)
-                    )
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_store_id ON losses(store_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_product_id ON losses(product_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_loss_date ON losses(loss_date)
-                """))
-                conn.commit()
-                logger.info("losses table created successfully")
-            else:
-                # PostgreSQL syntax
-                result = conn.execute(text("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_name='losses'
-                """))
-                if result.fetchone():
-                    logger.info("losses table already exists")
-                    return True
-                
-                logger.info("Creating losses table...")
-                conn.execute(text("""
-                    CREATE TABLE losses (
-                        id SERIAL PRIMARY KEY,
-                        store_id INTEGER NOT NULL,
-                        product_id INTEGER,
-                        loss_date DATE NOT NULL,
-                        loss_type VARCHAR(50) NOT NULL,
-                        quantity FLOAT NOT NULL,
-                        cost FLOAT NOT NULL,
-                        revenue_lost FLOAT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (store_id) REFERENCES stores(id),
-                        FOREIGN KEY (product_id) REFERENCES products(id)
-                    )
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_store_id ON losses(store_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_product_id ON losses(product_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_losses_loss_date ON losses(loss_date)
-                """))
-                conn.commit()
-                logger.info("losses table created successfully")
-            
-            logger.info("Migration completed successfully!")
-            return True
+        with engine.begin() as conn:
+            # checkfirst makes both the table and its indexes idempotent
+            logger.info("Creating losses table (if missing)...")
+            losses.create(conn, checkfirst=True)
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+            logger.info("losses table is up to date")
+        
+        logger.info("Migration completed successfully!")
+        return True
             
     except Exception as e:
         logger.error(f"Error during migration: {e}")
@@ -125,4 +86,3 @@ if __name__ == "__main__":
     else:
         print("❌ Migration failed. Check logs for details.")
         sys.exit(1)
-
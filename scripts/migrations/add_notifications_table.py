@@ -7,12 +7,45 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData,
+    String, Table, Text, create_engine, false, func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from shared.config import get_config
 from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+metadata = MetaData()
+
+# Referenced tables only need their primary keys so the foreign keys resolve
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("stores", metadata, Column("id", Integer, primary_key=True))
+
+# Column types are dialect-neutral; SQLAlchemy emits the SQLite/PostgreSQL DDL
+notifications = Table(
+    "notifications",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("store_id", Integer, ForeignKey("stores.id")),
+    Column("type", String(50), nullable=False),
+    Column("severity", String(20), server_default="info"),
+    Column("title", String(255), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("data", JSON().with_variant(JSONB, "postgresql")),
+    Column("read", Boolean, server_default=false(), nullable=False),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+)
+
+indexes = [
+    Index("idx_notifications_user_id", notifications.c.user_id),
+    Index("idx_notifications_store_id", notifications.c.store_id),
+    Index("idx_notifications_read", notifications.c.read),
+    Index("idx_notifications_created_at", notifications.c.created_at),
+]
+
 
 def migrate_database():
     """Create notifications table."""
@@ -30,93 +63,16 @@ def migrate_database():
     )
     
     try:
-        with engine.connect() as conn:
-            if "sqlite" in database_url:
-                # SQLite syntax
-                result = conn.execute(text("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='notifications'
-                """))
-                if result.fetchone():
-                    logger.info("notifications table already exists")
-                    return True
-                
-                logger.info("Creating notifications table...")
-                conn.execute(text("""
-                    CREATE TABLE notifications (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER NOT NULL,
-                        store_id INTEGER,
-                        type VARCHAR(50) NOT NULL,
-                        severity VARCHAR(20) DEFAULT 'info',
-                        title VARCHAR(255) NOT NULL,
-                        message TEXT NOT NULL,
-                        data TEXT,
-                        read BOOLEAN DEFAULT 0 NOT NULL,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users(id),
-                        FOREIGN KEY (store_id) REFERENCES stores(id)
-                    )
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_user_id ON notifications(user_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_store_id ON notifications(store_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_read ON notifications(read)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_created_at ON notifications(created_at)
-                """))
-                conn.commit()
-                logger.info("notifications table created successfully")
-            else:
-                # PostgreSQL syntax
-                result = conn.execute(text("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_name='notifications'
-                """))
-                if result.fetchone():
-                    logger.info("notifications table already exists")
-                    return True
-                
-                logger.info("Creating notifications table...")
-                conn.execute(text("""
-                    CREATE TABLE notifications (
-                        id SERIAL PRIMARY KEY,
-                        user_id INTEGER NOT NULL,
-                        store_id INTEGER,
-                        type VARCHAR(50) NOT NULL,
-                        severity VARCHAR(20) DEFAULT 'info',
-                        title VARCHAR(255) NOT NULL,
-                        message TEXT NOT NULL,
-                        data JSONB,
-                        read BOOLEAN DEFAULT FALSE NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (user_id) REFERENCES users(id),
-                        FOREIGN KEY (store_id) REFERENCES stores(id)
-                    )
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_user_id ON notifications(user_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_store_id ON notifications(store_id)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_read ON notifications(read)
-                """))
-                conn.execute(text("""
-                    CREATE INDEX idx_notifications_created_at ON notifications(created_at)
-                """))
-                conn.commit()
-                logger.info("notifications table created successfully")
-            
-            logger.info("Migration completed successfully!")
-            return True
+        with engine.begin() as conn:
+            # checkfirst makes both the table and its indexes idempotent
+            logger.info("Creating notifications table (if missing)...")
+            notifications.create(conn, checkfirst=True)
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+            logger.info("notifications table is up to date")
+        
+        logger.info("Migration completed successfully!")
+        return True
             
     except Exception as e:
         logger.error(f"Error during migration: {e}")
@@ -133,4 +89,3 @@ if __name__ == "__main__":
     else:
         print("❌ Migration failed. Check logs for details.")
         sys.exit(1)
-
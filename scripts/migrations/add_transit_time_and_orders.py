@@ -14,12 +14,45 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData,
+    String, Table, create_engine, func, inspect, text,
+)
 from shared.config import get_config
 from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+metadata = MetaData()
+
+# Referenced tables only need their primary keys so the foreign keys resolve
+Table("stores", metadata, Column("id", Integer, primary_key=True))
+Table("products", metadata, Column("id", Integer, primary_key=True))
+
+# Column types are dialect-neutral; SQLAlchemy emits the SQLite/PostgreSQL DDL
+orders = Table(
+    "orders",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("store_id", Integer, ForeignKey("stores.id"), nullable=False),
+    Column("product_id", Integer, ForeignKey("products.id"), nullable=False),
+    Column("order_quantity", Float, nullable=False),
+    Column("order_date", Date, nullable=False),
+    Column("expected_arrival_date", Date),
+    Column("actual_arrival_date", Date),
+    Column("status", String(50), server_default="pending"),
+    Column("transit_days", Integer),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("updated_at", DateTime, server_default=func.current_timestamp()),
+)
+
+indexes = [
+    Index("idx_orders_store_id", orders.c.store_id),
+    Index("idx_orders_product_id", orders.c.product_id),
+    Index("idx_orders_order_date", orders.c.order_date),
+    Index("idx_orders_expected_arrival", orders.c.expected_arrival_date),
+]
+
 
 def migrate_database():
     """Add transit_days column and create orders table."""
@@ -37,136 +70,33 @@ def migrate_database():
     )
     
     try:
-        with engine.connect() as conn:
-            # Check if columns already exist
-            if "sqlite" in database_url:
-                # SQLite syntax
-                result = conn.execute(text("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='products'
-                """))
-                if not result.fetchone():
-                    logger.error("Table 'products' does not exist. Run init_database.py first.")
-                    return False
-                
-                # Check if transit_days column exists
-                result = conn.execute(text("PRAGMA table_info(products)"))
-                columns = [row[1] for row in result.fetchall()]
-                
-                if 'transit_days' not in columns:
-                    logger.info("Adding transit_days column to products...")
-                    conn.execute(text("""
-                        ALTER TABLE products 
-                        ADD COLUMN transit_days INTEGER DEFAULT 1
-                    """))
-                    conn.commit()
-                    logger.info("transit_days column added successfully")
-                else:
-                    logger.info("transit_days column already exists")
-                
-                # Check if orders table exists
-                result = conn.execute(text("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name='orders'
+        with engine.begin() as conn:
+            inspector = inspect(conn)
+            if not inspector.has_table("products"):
+                logger.error("Table 'products' does not exist. Run init_database.py first.")
+                return False
+            
+            # Check if transit_days column exists
+            columns = [column["name"] for column in inspector.get_columns("products")]
+            if 'transit_days' not in columns:
+                logger.info("Adding transit_days column to products...")
+                conn.execute(text("""
+                    ALTER TABLE products 
+                    ADD COLUMN transit_days INTEGER DEFAULT 1
                 """))
-                if not result.fetchone():
-                    logger.info("Creating orders table...")
-                    conn.execute(text("""
-                        CREATE TABLE orders (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            store_id INTEGER NOT NULL,
-                            product_id INTEGER NOT NULL,
-                            order_quantity REAL NOT NULL,
-                            order_date DATE NOT NULL,
-                            expected_arrival_date DATE,
-                            actual_arrival_date DATE,
-                            status VARCHAR(50) DEFAULT 'pending',
-                            transit_days INTEGER,
-                            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                            FOREIGN KEY (store_id) REFERENCES stores(id),
-                            FOREIGN KEY (product_id) REFERENCES products(id)
-                        )
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_store_id ON orders(store_id)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_product_id ON orders(product_id)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_order_date ON orders(order_date)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_expected_arrival ON orders(expected_arrival_date)
-                    """))
-                    conn.commit()
-                    logger.info("orders table created successfully")
-                else:
-                    logger.info("orders table already exists")
+                logger.info("transit_days column added successfully")
             else:
-                # PostgreSQL syntax
-                result = conn.execute(text("""
-                    SELECT column_name 
-                    FROM information_schema.columns 
-                    WHERE table_name='products' 
-                    AND column_name='transit_days'
-                """))
-                if not result.fetchone():
-                    logger.info("Adding transit_days column to products...")
-                    conn.execute(text("""
-                        ALTER TABLE products 
-                        ADD COLUMN transit_days INTEGER DEFAULT 1
-                    """))
-                    conn.commit()
-                    logger.info("transit_days column added successfully")
-                else:
-                    logger.info("transit_days column already exists")
-                
-                # Check if orders table exists
-                result = conn.execute(text("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_name='orders'
-                """))
-                if not result.fetchone():
-                    logger.info("Creating orders table...")
-                    conn.execute(text("""
-                        CREATE TABLE orders (
-                            id SERIAL PRIMARY KEY,
-                            store_id INTEGER NOT NULL,
-                            product_id INTEGER NOT NULL,
-                            order_quantity FLOAT NOT NULL,
-                            order_date DATE NOT NULL,
-                            expected_arrival_date DATE,
-                            actual_arrival_date DATE,
-                            status VARCHAR(50) DEFAULT 'pending',
-                            transit_days INTEGER,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            FOREIGN KEY (store_id) REFERENCES stores(id),
-                            FOREIGN KEY (product_id) REFERENCES products(id)
-                        )
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_store_id ON orders(store_id)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_product_id ON orders(product_id)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_order_date ON orders(order_date)
-                    """))
-                    conn.execute(text("""
-                        CREATE INDEX idx_orders_expected_arrival ON orders(expected_arrival_date)
-                    """))
-                    conn.commit()
-                    logger.info("orders table created successfully")
-                else:
-                    logger.info("orders table already exists")
+                logger.info("transit_days column already exists")
             
-            logger.info("Migration completed successfully!")
-            return True
+            # checkfirst makes both the table and its indexes idempotent
+            logger.info("Creating orders table (if missing)...")
+            orders.create(conn, checkfirst=True)
+            for index in indexes:
+                index.create(conn, checkfirst=True)
+            logger.info("orders table is up to date")
+        
+        logger.info("Migration completed successfully!")
+        return True
             
     except Exception as e:
         logger.error(f"Error during migration: {e}")
@@ -183,4 +113,3 @@ if __name__ == "__main__":
     else:
         print("❌ Migration failed. Check logs for details.")
         sys.exit(1)
-
@@ -20,7 +20,7 @@ from shared.logging_setup import setup_logging, get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
 from services.ingestion.datasets import load_freshretailnet_dataset
 from services.ingestion.data_quality import validate_data_quality
-from shared.utils import add_calendar_features
+from shared.utils import add_calendar_features, parse_dates
 
 # Setup
 setup_logging()
@@ -55,8 +55,7 @@ def run_eda():
     stockout_col = COLUMN_MAPPINGS.get('stockout_col', 'stock_hour6_22_cnt')
     
     # Convert date column
-    if df[date_col].dtype == 'object':
-        df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_dates(df[date_col])
     
     # Add calendar features
     df = add_calendar_features(df, date_col)
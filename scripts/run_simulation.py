@@ -9,21 +9,27 @@ This script:
 5. Generates comparison report
 """
 
+import gc
 import sys
+from collections import deque
+from itertools import islice
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
 import numpy as np
+import joblib
+from joblib import Parallel, delayed
 from datetime import datetime, timedelta
 
 from shared.config import get_config
 from shared.logging_setup import setup_logging, get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
+from shared.mvp_loader import load_mvp_stores
+from shared.utils import parse_dates
 from services.ingestion.datasets import load_freshretailnet_dataset
 from services.forecasting.features.aggregate_daily import aggregate_to_daily
-from services.forecasting.models.baseline import MovingAverageForecaster
 from services.forecasting.models.lightgbm_model import LightGBMForecaster
 from services.forecasting.features.feature_engineering import create_forecast_features
 from services.replenishment.policy import OrderUpToPolicy
@@ -35,6 +41,93 @@ setup_logging()
 logger = get_logger(__name__)
 config = get_config()
 
+# Filtered frames are only read or reassigned column-wise, so let
+# Copy-on-Write share their data instead of copying eagerly
+# (pandas 3 always uses Copy-on-Write and deprecates the option)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+# Feature settings mirroring create_forecast_features defaults; the simulator
+# builds features from the last FEATURE_HISTORY_DAYS observations only
+FEATURE_HISTORY_DAYS = 14
+FEATURE_LAGS = [1, 7, 14, 28]
+FEATURE_WINDOWS = [7, 14, 28]
+
+
+def _feature_names(store_col, sku_col):
+    """
+    Names of the features computed by _latest_feature_values, in order.
+
+    Args:
+        store_col: Store column name (for the encoded feature name)
+        sku_col: SKU column name (for the encoded feature name)
+
+    Returns:
+        List of feature names
+    """
+    names = [
+        'year', 'month', 'day', 'dayofweek', 'dayofyear', 'week', 'quarter',
+        'is_weekend', 'is_month_start', 'is_month_end',
+        'is_quarter_start', 'is_quarter_end',
+    ]
+    names += [f'demand_lag_{lag}' for lag in FEATURE_LAGS]
+    for window in FEATURE_WINDOWS:
+        names += [
+            f'demand_rolling_{stat}_{window}' for stat in ('mean', 'std', 'max', 'min')
+        ]
+    names += [f'{store_col}_encoded', f'{sku_col}_encoded']
+    return names
+
+
+def _latest_feature_values(dates, demands, out):
+    """
+    Compute the forecast features of the most recent observation.
+
+    Produces the same values create_forecast_features would give the last row
+    of a single store-SKU history (missing values filled with 0), without
+    building and transforming a DataFrame.
+
+    Args:
+        dates: Observation dates, oldest first
+        demands: Observed demand aligned with dates
+        out: Array receiving the features in _feature_names order
+    """
+    values = np.asarray(demands, dtype=float)
+    n = len(values)
+    date = pd.Timestamp(dates[-1])
+    
+    out[:12] = (
+        date.year,
+        date.month,
+        date.day,
+        date.dayofweek,
+        date.dayofyear,
+        date.isocalendar()[1],
+        date.quarter,
+        date.dayofweek in (5, 6),
+        date.is_month_start,
+        date.is_month_end,
+        date.is_quarter_start,
+        date.is_quarter_end,
+    )
+    
+    i = 12
+    for lag in FEATURE_LAGS:
+        out[i] = values[-1 - lag] if lag < n else 0.0
+        i += 1
+    
+    for window in FEATURE_WINDOWS:
+        recent = values[-window:]
+        out[i] = recent.mean()
+        out[i + 1] = recent.std(ddof=1) if len(recent) > 1 else 0.0
+        out[i + 2] = recent.max()
+        out[i + 3] = recent.min()
+        i += 4
+    
+    # Store and SKU encodings are always 0 for a single store-SKU history
+    out[i:i + 2] = 0.0
+
 
 def load_mvp_data():
     """Load MVP subset data."""
@@ -50,85 +143,383 @@ def load_mvp_data():
     category_col = COLUMN_MAPPINGS.get('category_col', 'first_category_id')
     
     # Load MVP stores
-    mvp_file = Path(config.data.processed_path) / "mvp_selection" / "mvp_subset.txt"
-    stores = []
-    if mvp_file.exists():
-        with open(mvp_file, 'r') as f:
-            lines = f.readlines()
-        in_stores_section = False
-        for line in lines:
-            if "Selected Stores" in line:
-                in_stores_section = True
-                continue
-            if in_stores_section and line.strip() and not line.strip().startswith("Selected SKUs"):
-                try:
-                    stores.append(int(line.strip()))
-                except ValueError:
-                    pass
-            if "Selected SKUs" in line:
-                break
+    stores = load_mvp_stores()
     
     if stores:
-        df = df[df[store_col].isin(stores)].copy()
+        # Filter on integer category codes so the mask is a pure numpy lookup
+        store_codes = df[store_col].astype('category')
+        selected = set(stores)
+        selected_codes = np.array(
+            [code for code, store in enumerate(store_codes.cat.categories) if store in selected],
+            dtype=store_codes.cat.codes.dtype
+        )
+        df = df[np.isin(store_codes.cat.codes.to_numpy(), selected_codes)]
     
-    if df[date_col].dtype == 'object':
-        df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_dates(df[date_col])
     
     logger.info(f"Loaded {len(df):,} records")
     
     return df, store_col, sku_col, date_col, sales_col, category_col
 
 
+def _run_heuristic_policy(demands, lengths, initial_inventory):
+    """
+    Run the heuristic policy recurrence for many store-SKUs at once.
+
+    The recurrence is sequential in time but independent across store-SKUs,
+    so each simulated day is a handful of numpy operations over all of them.
+
+    Args:
+        demands: Array (n_store_skus, n_days) of daily demand, left-aligned
+        lengths: Number of valid days per store-SKU row
+        initial_inventory: Starting inventory level
+
+    Returns:
+        Tuple of arrays (total_demand, total_ordered, total_waste, total_stockouts)
+    """
+    n_groups, n_days = demands.shape
+    inventory = np.full(n_groups, initial_inventory, dtype=float)
+    total_ordered = np.zeros(n_groups)
+    total_waste = np.zeros(n_groups)
+    total_stockouts = np.zeros(n_groups)
+    
+    for day in range(n_days):
+        active = lengths > day
+        demand = demands[:, day]
+        
+        # Simple heuristic: order if inventory < threshold
+        order_qty = np.where(active & (inventory < 20), 50.0, 0.0)
+        total_ordered += order_qty
+        inventory += order_qty
+        
+        # Sales
+        sales = np.minimum(demand, inventory)
+        total_stockouts += np.maximum(0, demand - inventory)
+        inventory -= sales
+        
+        # Simple waste: 5% daily
+        waste = np.where(active, inventory * 0.05, 0.0)
+        total_waste += waste
+        inventory -= waste
+    
+    return demands.sum(axis=1), total_ordered, total_waste, total_stockouts
+
+
 def simulate_heuristic_policy(sim_data, store_col, sku_col, initial_inventory=50.0):
     """Simulate simple heuristic policy."""
     logger.info("Simulating heuristic policy")
     
-    results = []
+    groups = list(islice(sim_data.groupby([store_col, sku_col], sort=False), 100))  # Limit for speed
+    if not groups:
+        return pd.DataFrame()
+    
+    # Daily demand per store-SKU, padded with zeros past each series' end
+    series = [group_df.sort_values('date')['demand'].to_numpy(dtype=float) for _, group_df in groups]
+    lengths = np.array([len(values) for values in series])
+    demands = np.zeros((len(series), lengths.max()))
+    for i, values in enumerate(series):
+        demands[i, :len(values)] = values
+    
+    total_demand, total_ordered, total_waste, total_stockouts = _run_heuristic_policy(
+        demands, lengths, initial_inventory
+    )
+    
+    results = pd.DataFrame({
+        store_col: [store_id for (store_id, _), _ in groups],
+        sku_col: [sku_id for (_, sku_id), _ in groups],
+        'policy': 'heuristic',
+        'total_demand': total_demand,
+        'total_ordered': total_ordered,
+        'total_waste': total_waste,
+        'total_stockouts': total_stockouts,
+    })
+    results['service_level'] = np.divide(
+        total_demand - total_stockouts, total_demand,
+        out=np.zeros(len(results)), where=total_demand > 0
+    )
+    results['waste_rate'] = np.divide(
+        total_waste, total_ordered,
+        out=np.zeros(len(results)), where=total_ordered > 0
+    )
+    
+    return results
+
+
+def _simulate_store_sku(
+    store_id,
+    sku_id,
+    train_group,
+    sim_group,
+    store_col,
+    sku_col,
+    category_col,
+    date_col,
+    policy,
+    markdown_policy,
+    use_lightgbm,
+    initial_inventory
+):
+    """
+    Simulate the model-based policy for one store-SKU, day by day.
+
+    This is a generator so that LightGBM predictions can be batched across
+    store-SKUs: whenever a forecast is needed it yields the feature row of the
+    latest observation and expects the predicted daily demand to be sent back
+    (or None to fall back to the moving average). The result dictionary is
+    returned when the simulation finishes.
+    """
+    # Demand history for forecasting; grown with plain lists and only
+    # materialized as a small DataFrame over the tail a model needs
+    history_dates = train_group['date'].tolist()
+    history_demands = train_group['demand'].tolist()
+    
+    def recent_history(n):
+        return pd.DataFrame({
+            store_col: store_id,
+            sku_col: sku_id,
+            date_col: history_dates[-n:],
+            'demand': history_demands[-n:]
+        })
     
-    for (store_id, sku_id), group_df in list(sim_data.groupby([store_col, sku_col]))[:100]:  # Limit for speed
-        group_df = group_df.sort_values('date')
+    # 7-day moving average window, rolled forward as demand is observed
+    ma_window = deque(history_demands[-7:], maxlen=7)
+    
+    # Get shelf-life
+    category_id = train_group[category_col].iloc[0] if category_col in train_group.columns else None
+    shelf_life = config.shelf_life.get_shelf_life(category_id) if category_id else 5
+    
+    # Initialize inventory tracking
+    inventory = initial_inventory
+    total_ordered = 0.0
+    total_waste = 0.0
+    total_stockouts = 0.0
+    total_demand = 0.0
+    total_markdown_sales = 0.0
+    total_markdown_revenue = 0.0
+    
+    current_date = sim_group['date'].min()
+    tracker = InventoryAgeTracker(current_date)
+    
+    # Add initial inventory to tracker
+    if inventory > 0:
+        expiry_date = current_date + timedelta(days=shelf_life)
+        tracker.add_inventory(inventory, expiry_date)
+    
+    # Prepare feature columns for LightGBM (if using)
+    feature_cols = None
+    if use_lightgbm:
+        try:
+            # Create features for a sample to get feature columns
+            sample_features = create_forecast_features(
+                recent_history(FEATURE_HISTORY_DAYS),
+                date_col=date_col,
+                target_col='demand',
+                store_col=store_col,
+                sku_col=sku_col
+            )
+            # Get feature columns (exclude metadata)
+            exclude_cols = [date_col, store_col, sku_col, 'demand', category_col]
+            feature_cols = [col for col in sample_features.columns if col not in exclude_cols]
+        except Exception as e:
+            logger.warning(f"Could not create features for {store_id}-{sku_id}: {e}, using Moving Average")
+    
+    if feature_cols:
+        # Feature values are computed into a reusable float32 buffer with a
+        # trailing zero slot, then gathered into feature_cols order (missing as 0)
+        feature_names = _feature_names(store_col, sku_col)
+        feature_values = np.zeros(len(feature_names) + 1, dtype=np.float32)
+        positions = {name: i for i, name in enumerate(feature_names)}
+        feature_index = np.array([positions.get(col, len(feature_names)) for col in feature_cols])
+        X_row = np.empty(len(feature_cols), dtype=np.float32)
+    
+    for row in sim_group.itertuples(index=False):
+        date = row.date
+        demand = row.demand
+        total_demand += demand
+        discount_pct = 0.0  # Initialize discount
         
-        inventory = initial_inventory
-        total_ordered = 0.0
-        total_waste = 0.0
-        total_stockouts = 0.0
-        total_demand = 0.0
+        # Update tracker date
+        tracker.current_date = date
         
-        for _, row in group_df.iterrows():
-            demand = row['demand']
-            total_demand += demand
-            
-            # Simple heuristic: order if inventory < threshold
-            if inventory < 20:
-                order_qty = 50.0
-                total_ordered += order_qty
-                inventory += order_qty
-            
-            # Sales
-            sales = min(demand, inventory)
-            stockouts = max(0, demand - inventory)
-            total_stockouts += stockouts
-            
-            inventory -= sales
-            
-            # Simple waste: 5% daily
-            waste = inventory * 0.05
+        # Check for markdown opportunities (before sales)
+        expiring_soon = tracker.get_expiring_units(3)  # Units expiring in next 3 days
+        if expiring_soon > 0:
+            # Get discount for nearest expiry (buckets are sorted by expiry)
+            nearest_expiry = tracker.get_nearest_expiry_days()
+            if nearest_expiry is not None and nearest_expiry <= 3:
+                discount_pct = markdown_policy.get_discount_for_expiry(
+                    days_until_expiry=nearest_expiry,
+                    current_inventory=inventory
+                )
+                if discount_pct > 0:
+                    # Estimate demand uplift from markdown
+                    base_demand = demand
+                    uplifted_demand = markdown_policy.estimate_demand_uplift(
+                        base_demand=base_demand,
+                        discount_percent=discount_pct,
+                        price_elasticity=-2.0
+                    )
+                    demand = uplifted_demand  # Use uplifted demand for this day
+        
+        # Forecast demand for next 7 days
+        forecasted_daily = None
+        if feature_cols:
+            try:
+                # Features of the latest observation
+                _latest_feature_values(
+                    history_dates[-FEATURE_HISTORY_DAYS:],
+                    history_demands[-FEATURE_HISTORY_DAYS:],
+                    feature_values
+                )
+                np.take(feature_values, feature_index, out=X_row)
+            except Exception as e:
+                logger.debug(f"Feature creation failed for {store_id}-{sku_id}: {e}, using Moving Average")
+            else:
+                # Predicted by the caller, batched with other store-SKUs
+                forecasted_daily = yield X_row
+        
+        if forecasted_daily is not None:
+            forecasted_demand = max(0, forecasted_daily * 7)  # 7-day forecast
+        else:
+            # Use Moving Average
+            forecasted_demand = sum(ma_window) / len(ma_window) * 7
+        
+        # Calculate expiring units
+        expiring_units = tracker.get_expiring_units(7)
+        
+        # Calculate order quantity
+        order_qty = policy.calculate_order_quantity(
+            forecasted_demand=forecasted_demand,
+            current_inventory=inventory,
+            inbound_orders=0.0,
+            expiring_units=expiring_units,
+            max_sellable_before_expiry=tracker.get_max_sellable_before_expiry(
+                forecasted_daily_demand=forecasted_demand / 7,
+                coverage_days=7
+            ) if len(tracker.buckets) > 0 else None
+        )
+        
+        if order_qty > 0:
+            total_ordered += order_qty
+            inventory += order_qty
+            expiry_date = date + timedelta(days=shelf_life)
+            tracker.add_inventory(order_qty, expiry_date)
+        
+        # Sales (limited by inventory)
+        sales = min(demand, inventory)
+        stockouts = max(0, demand - inventory)
+        total_stockouts += stockouts
+        inventory -= sales
+        
+        # Track markdown sales
+        if discount_pct > 0 and sales > 0:
+            total_markdown_sales += sales
+            # Assume unit price = 10, cost = 5 for revenue calculation
+            unit_price = 10.0
+            discounted_price = unit_price * (1 - discount_pct / 100.0)
+            total_markdown_revenue += sales * discounted_price
+        
+        # Waste: units that expire today
+        tracker.current_date = date
+        for waste in tracker.remove_expired():
             total_waste += waste
             inventory -= waste
         
-        results.append({
-            store_col: store_id,
-            sku_col: sku_id,
-            'policy': 'heuristic',
-            'total_demand': total_demand,
-            'total_ordered': total_ordered,
-            'total_waste': total_waste,
-            'total_stockouts': total_stockouts,
-            'service_level': (total_demand - total_stockouts) / total_demand if total_demand > 0 else 0,
-            'waste_rate': total_waste / total_ordered if total_ordered > 0 else 0
-        })
+        # Update history for next iteration (actual demand, not uplifted)
+        history_dates.append(date)
+        history_demands.append(row.demand)
+        ma_window.append(row.demand)
+    
+    return {
+        store_col: store_id,
+        sku_col: sku_id,
+        'policy': 'model_based',
+        'total_demand': total_demand,
+        'total_ordered': total_ordered,
+        'total_waste': total_waste,
+        'total_stockouts': total_stockouts,
+        'total_markdown_sales': total_markdown_sales,
+        'total_markdown_revenue': total_markdown_revenue,
+        'service_level': (total_demand - total_stockouts) / total_demand if total_demand > 0 else 0,
+        'waste_rate': total_waste / total_ordered if total_ordered > 0 else 0
+    }
+
+
+def _simulate_store_sku_batch(
+    store_sku_groups,
+    store_col,
+    sku_col,
+    category_col,
+    date_col,
+    lightgbm_model,
+    use_lightgbm,
+    initial_inventory
+):
+    """
+    Simulate the model-based policy for a batch of store-SKUs.
+    
+    All store-SKUs in the batch are advanced together so that each simulated
+    day needs a single LightGBM predict call for every store-SKU awaiting a
+    forecast.
+    
+    Args:
+        store_sku_groups: List of ((store_id, sku_id), train_group, sim_group),
+            with both groups sorted by date
+        (remaining arguments as in simulate_model_based_policy)
+    
+    Returns:
+        List of result dictionaries, in input order
+    """
+    policy = OrderUpToPolicy()
+    markdown_policy = MarkdownPolicy()
     
-    return pd.DataFrame(results)
+    simulations = {}
+    pending = {}  # (store_id, sku_id) -> feature row awaiting a forecast
+    results = {}
+    
+    def advance(key, forecasted_daily=None):
+        """Run one store-SKU simulation until it needs a forecast or finishes."""
+        try:
+            pending[key] = simulations[key].send(forecasted_daily)
+        except StopIteration as stop:
+            results[key] = stop.value
+        except Exception as e:
+            logger.warning(f"Error for {key[0]}-{key[1]}: {e}")
+    
+    # The day loop allocates many short-lived objects but builds no cycles,
+    # so keep the cyclic collector out of it and collect once at the end
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for key, train_group, sim_group in store_sku_groups:
+            store_id, sku_id = key
+            simulations[key] = _simulate_store_sku(
+                store_id, sku_id, train_group, sim_group,
+                store_col, sku_col, category_col, date_col,
+                policy, markdown_policy,
+                use_lightgbm=use_lightgbm and lightgbm_model is not None,
+                initial_inventory=initial_inventory
+            )
+            advance(key)
+        
+        # One batched LightGBM call per simulated day
+        while pending:
+            keys = list(pending)
+            X_pred = np.vstack([pending.pop(key) for key in keys])
+            try:
+                forecasts = lightgbm_model.predict(X_pred)
+            except Exception as e:
+                logger.debug(f"LightGBM prediction failed: {e}, using Moving Average")
+                forecasts = [None] * len(keys)
+            
+            for key, forecasted_daily in zip(keys, forecasts):
+                advance(key, forecasted_daily)
+    finally:
+        gc.collect()
+        if gc_was_enabled:
+            gc.enable()
+    
+    return [results[key] for key, _, _ in store_sku_groups if key in results]
 
 
 def simulate_model_based_policy(
@@ -140,11 +531,15 @@ def simulate_model_based_policy(
     date_col,
     lightgbm_model=None,
     use_lightgbm=True,
-    initial_inventory=50.0
+    initial_inventory=50.0,
+    n_jobs=None
 ):
     """
     Simulate model-based policy with LightGBM forecasting.
     
+    Store-SKUs are independent, so they are split into one batch per worker
+    process and simulated in parallel.
+    
     Args:
         train_data: Training data
         sim_data: Simulation data
@@ -155,19 +550,15 @@ def simulate_model_based_policy(
         lightgbm_model: Pre-trained LightGBM model (optional)
         use_lightgbm: Whether to use LightGBM (True) or Moving Average (False)
         initial_inventory: Starting inventory level
+        n_jobs: Number of worker processes (default: config.performance.max_workers)
     """
     logger.info(f"Simulating model-based policy (LightGBM={use_lightgbm})")
     
-    results = []
-    policy = OrderUpToPolicy()
-    markdown_policy = MarkdownPolicy()
-    
     # Load LightGBM model if available and requested
     if use_lightgbm and lightgbm_model is None:
         model_path = Path(config.data.models_dir) / "lightgbm_model.pkl"
         if model_path.exists():
             try:
-                import joblib
                 lightgbm_model = joblib.load(model_path)
                 logger.info("✅ Loaded pre-trained LightGBM model")
             except Exception as e:
@@ -177,226 +568,37 @@ def simulate_model_based_policy(
             logger.warning("LightGBM model not found, using Moving Average")
             use_lightgbm = False
     
-    store_skus = list(sim_data.groupby([store_col, sku_col]).groups.keys())[:100]  # Limit for speed
+    # Split both frames by store-SKU in one hash-groupby pass each
+    sim_groups = dict(islice(sim_data.groupby([store_col, sku_col], sort=False), 100))  # Limit for speed
+    train_groups = dict(iter(train_data.groupby([store_col, sku_col], sort=False)))
     
-    for (store_id, sku_id) in store_skus:
-        try:
-            train_group = train_data[
-                (train_data[store_col] == store_id) & 
-                (train_data[sku_col] == sku_id)
-            ].sort_values('date')
-            
-            sim_group = sim_data[
-                (sim_data[store_col] == store_id) & 
-                (sim_data[sku_col] == sku_id)
-            ].sort_values('date')
-            
-            if len(train_group) < 7 or len(sim_group) == 0:
-                continue
-            
-            # Prepare data for forecasting
-            train_df = train_group.copy()
-            train_df[store_col] = store_id
-            train_df[sku_col] = sku_id
-            
-            # Get shelf-life
-            category_id = train_group[category_col].iloc[0] if category_col in train_group.columns else None
-            shelf_life = config.shelf_life.get_shelf_life(category_id) if category_id else 5
-            
-            # Initialize inventory tracking
-            inventory = initial_inventory
-            total_ordered = 0.0
-            total_waste = 0.0
-            total_stockouts = 0.0
-            total_demand = 0.0
-            total_markdown_sales = 0.0
-            total_markdown_revenue = 0.0
-            
-            current_date = sim_group['date'].min()
-            tracker = InventoryAgeTracker(current_date)
-            
-            # Add initial inventory to tracker
-            if inventory > 0:
-                expiry_date = current_date + timedelta(days=shelf_life)
-                tracker.add_inventory(inventory, expiry_date)
-            
-            # Prepare feature columns for LightGBM (if using)
-            feature_cols = None
-            if use_lightgbm and lightgbm_model is not None:
-                try:
-                    # Create features for a sample to get feature columns
-                    sample_features = create_forecast_features(
-                        train_df.tail(14),
-                        date_col=date_col,
-                        target_col='demand',
-                        store_col=store_col,
-                        sku_col=sku_col
-                    )
-                    # Get feature columns (exclude metadata)
-                    exclude_cols = [date_col, store_col, sku_col, 'demand', category_col]
-                    feature_cols = [col for col in sample_features.columns if col not in exclude_cols]
-                except Exception as e:
-                    logger.warning(f"Could not create features for {store_id}-{sku_id}: {e}, using Moving Average")
-                    use_lightgbm = False
-            
-            for _, row in sim_group.iterrows():
-                date = row['date']
-                demand = row['demand']
-                total_demand += demand
-                discount_pct = 0.0  # Initialize discount
-                
-                # Update tracker date
-                tracker.current_date = date
-                for bucket in tracker.buckets:
-                    bucket.update_days_until_expiry(date)
-                
-                # Check for markdown opportunities (before sales)
-                expiring_soon = tracker.get_expiring_units(3)  # Units expiring in next 3 days
-                if expiring_soon > 0:
-                    # Get discount for nearest expiry
-                    nearest_expiry = min([b.days_until_expiry for b in tracker.buckets if b.days_until_expiry is not None and b.days_until_expiry <= 3], default=None)
-                    if nearest_expiry is not None:
-                        discount_pct = markdown_policy.get_discount_for_expiry(
-                            days_until_expiry=nearest_expiry,
-                            current_inventory=inventory
-                        )
-                        if discount_pct > 0:
-                            # Estimate demand uplift from markdown
-                            base_demand = demand
-                            uplifted_demand = markdown_policy.estimate_demand_uplift(
-                                base_demand=base_demand,
-                                discount_percent=discount_pct,
-                                price_elasticity=-2.0
-                            )
-                            demand = uplifted_demand  # Use uplifted demand for this day
-                
-                # Forecast demand for next 7 days
-                if use_lightgbm and lightgbm_model is not None and feature_cols:
-                    try:
-                        # Create features for forecast
-                        forecast_input = train_df.tail(14).copy()
-                        forecast_features = create_forecast_features(
-                            forecast_input,
-                            date_col=date_col,
-                            target_col='demand',
-                            store_col=store_col,
-                            sku_col=sku_col
-                        )
-                        
-                        # Ensure all feature columns exist
-                        for col in feature_cols:
-                            if col not in forecast_features.columns:
-                                forecast_features[col] = 0
-                        
-                        # Predict using LightGBM
-                        X_pred = forecast_features[feature_cols].fillna(0)
-                        forecasted_daily = lightgbm_model.predict(X_pred.iloc[-1:].values)[0]
-                        forecasted_demand = max(0, forecasted_daily * 7)  # 7-day forecast
-                    except Exception as e:
-                        logger.debug(f"LightGBM prediction failed for {store_id}-{sku_id}: {e}, using Moving Average")
-                        # Fallback to Moving Average
-                        forecast_model = MovingAverageForecaster(window=7)
-                        forecast_model.train(
-                            pd.DataFrame({'date': train_df['date'], 'demand': train_df['demand']}),
-                            target_col='demand'
-                        )
-                        forecast = forecast_model.predict(
-                            pd.DataFrame({'date': train_df.tail(7)['date'], 'demand': train_df.tail(7)['demand']}),
-                            horizon=7
-                        )
-                        forecasted_demand = forecast['predicted_demand'].mean() * 7
-                else:
-                    # Use Moving Average
-                    forecast_model = MovingAverageForecaster(window=7)
-                    forecast_model.train(
-                        pd.DataFrame({'date': train_df['date'], 'demand': train_df['demand']}),
-                        target_col='demand'
-                    )
-                    forecast = forecast_model.predict(
-                        pd.DataFrame({'date': train_df.tail(7)['date'], 'demand': train_df.tail(7)['demand']}),
-                        horizon=7
-                    )
-                    forecasted_demand = forecast['predicted_demand'].mean() * 7
-                
-                # Calculate expiring units
-                expiring_units = tracker.get_expiring_units(7)
-                
-                # Calculate order quantity
-                order_qty = policy.calculate_order_quantity(
-                    forecasted_demand=forecasted_demand,
-                    current_inventory=inventory,
-                    inbound_orders=0.0,
-                    expiring_units=expiring_units,
-                    max_sellable_before_expiry=tracker.get_max_sellable_before_expiry(
-                        forecasted_daily_demand=forecasted_demand / 7,
-                        coverage_days=7
-                    ) if len(tracker.buckets) > 0 else None
-                )
-                
-                if order_qty > 0:
-                    total_ordered += order_qty
-                    inventory += order_qty
-                    expiry_date = date + timedelta(days=shelf_life)
-                    tracker.add_inventory(order_qty, expiry_date)
-                
-                # Sales (limited by inventory)
-                sales = min(demand, inventory)
-                stockouts = max(0, demand - inventory)
-                total_stockouts += stockouts
-                inventory -= sales
-                
-                # Track markdown sales
-                if discount_pct > 0 and sales > 0:
-                    total_markdown_sales += sales
-                    # Assume unit price = 10, cost = 5 for revenue calculation
-                    unit_price = 10.0
-                    discounted_price = unit_price * (1 - discount_pct / 100.0)
-                    total_markdown_revenue += sales * discounted_price
-                
-                # Waste: units that expire today
-                tracker.current_date = date
-                expired_buckets = []
-                for bucket in tracker.buckets:
-                    bucket.update_days_until_expiry(date)
-                    if bucket.days_until_expiry == 0 and bucket.quantity > 0:
-                        waste = bucket.quantity
-                        total_waste += waste
-                        inventory -= waste
-                        expired_buckets.append(bucket)
-                
-                # Remove expired buckets
-                for bucket in expired_buckets:
-                    tracker.buckets.remove(bucket)
-                
-                # Update training data for next iteration
-                train_df = pd.concat([
-                    train_df,
-                    pd.DataFrame([{
-                        date_col: date, 
-                        'demand': row['demand'],  # Use actual demand, not uplifted
-                        store_col: store_id, 
-                        sku_col: sku_id
-                    }])
-                ], ignore_index=True)
-            
-            results.append({
-                store_col: store_id,
-                sku_col: sku_id,
-                'policy': 'model_based',
-                'total_demand': total_demand,
-                'total_ordered': total_ordered,
-                'total_waste': total_waste,
-                'total_stockouts': total_stockouts,
-                'total_markdown_sales': total_markdown_sales,
-                'total_markdown_revenue': total_markdown_revenue,
-                'service_level': (total_demand - total_stockouts) / total_demand if total_demand > 0 else 0,
-                'waste_rate': total_waste / total_ordered if total_ordered > 0 else 0
-            })
-        except Exception as e:
-            logger.warning(f"Error for {store_id}-{sku_id}: {e}")
+    store_sku_groups = []
+    for key, sim_group in sim_groups.items():
+        train_group = train_groups.get(key)
+        if train_group is None or len(train_group) < 7:
             continue
+        store_sku_groups.append((key, train_group.sort_values('date'), sim_group.sort_values('date')))
+    
+    if not store_sku_groups:
+        return pd.DataFrame()
+    
+    # Contiguous batches, one per worker, so results keep store-SKU order
+    n_jobs = min(n_jobs or config.performance.max_workers, len(store_sku_groups))
+    batch_size = -(-len(store_sku_groups) // n_jobs)
+    batches = [
+        store_sku_groups[start:start + batch_size]
+        for start in range(0, len(store_sku_groups), batch_size)
+    ]
+    
+    batch_results = Parallel(n_jobs=n_jobs)(
+        delayed(_simulate_store_sku_batch)(
+            batch, store_col, sku_col, category_col, date_col,
+            lightgbm_model, use_lightgbm, initial_inventory
+        )
+        for batch in batches
+    )
     
-    return pd.DataFrame(results)
+    return pd.DataFrame([result for results in batch_results for result in results])
 
 
 def main():
@@ -417,12 +619,14 @@ def main():
         agg_func='sum'
     )
     df_daily = df_daily.rename(columns={date_col: 'date', sales_col: 'demand'})
-    df_daily = df_daily.sort_values(['date', store_col, sku_col])
+    # aggregate_to_daily returns rows ordered by store, SKU and date, so a
+    # stable sort on the date index yields date, store, SKU order
+    df_daily = df_daily.set_index('date').sort_index(kind='mergesort')
     
-    # Split train/sim
-    sim_start = df_daily['date'].max() - timedelta(days=30)
-    train_data = df_daily[df_daily['date'] <= sim_start].copy()
-    sim_data = df_daily[df_daily['date'] > sim_start].copy()
+    # Split train/sim by slicing the sorted date index
+    sim_start = df_daily.index.max() - timedelta(days=30)
+    train_data = df_daily.loc[:sim_start].reset_index()
+    sim_data = df_daily.loc[sim_start + timedelta(days=1):].reset_index()
     
     logger.info(f"Train: {len(train_data):,} records")
     logger.info(f"Sim: {len(sim_data):,} records")
@@ -437,7 +641,6 @@ def main():
     model_path = Path(config.data.models_dir) / "lightgbm_model.pkl"
     if model_path.exists():
         try:
-            import joblib
             model_data = joblib.load(model_path)
             lightgbm_model = model_data.get('model')
             logger.info("✅ Loaded LightGBM model for simulation")
@@ -1,8 +1,6 @@
 """Seed initial product prices and costs from dataset or defaults."""
 
 import sys
-import random
-import hashlib
 from pathlib import Path
 
 # Add project root to path
@@ -10,6 +8,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from datetime import date
+import numpy as np
+import xxhash
 from sqlalchemy.orm import Session
 
 from services.api_gateway.database import SessionLocal, init_db
@@ -33,43 +33,70 @@ CATEGORY_PRICE_RANGES = {
 }
 
 
-def _get_product_price_for_sku(sku_id: str, category_id: int = None) -> tuple:
+def _sku_uniform(sku_id: str) -> float:
+    """Map a SKU to a consistent pseudo-random number in [0, 1)."""
+    # Take the top 52 bits of a fast non-cryptographic 64-bit hash as the
+    # fraction directly, without touching the global random state
+    hash_val = xxhash.xxh64_intdigest(str(sku_id).encode())
+    return (hash_val >> 12) / (1 << 52)
+
+
+def _get_product_prices(sku_ids, category_ids) -> tuple:
     """
-    Generate a consistent but varied price for a product.
+    Generate consistent but varied prices and costs for many products at once.
     
     Uses hash of SKU to ensure same SKU always gets same price,
     but different SKUs get different prices.
+    
+    Args:
+        sku_ids: Product SKU identifiers
+        category_ids: Category ID per product (unknown IDs use the default range)
+    
+    Returns:
+        Tuple of numpy arrays (prices, costs)
     """
-    # Get price range for category
-    price_range = CATEGORY_PRICE_RANGES.get(category_id, CATEGORY_PRICE_RANGES['default'])
-    min_price, max_price, margin = price_range
+    uniforms = np.fromiter((_sku_uniform(sku_id) for sku_id in sku_ids), dtype=float, count=len(sku_ids))
     
-    # Use hash of SKU to generate consistent random-looking price
-    hash_val = int(hashlib.md5(str(sku_id).encode()).hexdigest()[:8], 16)
-    random.seed(hash_val)
+    # Look up (min_price, max_price, margin) once per distinct category
+    categories, inverse = np.unique(np.asarray(category_ids, dtype=np.int64), return_inverse=True)
+    ranges = np.array([
+        CATEGORY_PRICE_RANGES.get(int(category), CATEGORY_PRICE_RANGES['default'])
+        for category in categories
+    ]).reshape(-1, 3)
+    min_price, max_price, margin = ranges[inverse.ravel()].T
     
     # Generate price within range (round to .49 or .99 endings for realism)
-    base_price = min_price + (max_price - min_price) * random.random()
+    base_price = min_price + (max_price - min_price) * uniforms
     
     # Round to realistic price endings
-    price_int = int(base_price)
+    price_int = np.floor(base_price)
     decimal = base_price - price_int
-    if decimal < 0.25:
-        final_price = price_int + 0.29
-    elif decimal < 0.50:
-        final_price = price_int + 0.49
-    elif decimal < 0.75:
-        final_price = price_int + 0.79
-    else:
-        final_price = price_int + 0.99
+    final_price = price_int + np.select(
+        [decimal < 0.25, decimal < 0.50, decimal < 0.75],
+        [0.29, 0.49, 0.79],
+        default=0.99
+    )
     
     # Calculate cost based on margin
     cost = final_price * (1 - margin)
     
-    # Reset random seed
-    random.seed()
+    # Python's round() (correctly rounded) rather than np.round, which can
+    # land on the other side of half-cent ties such as 1.145
+    return (
+        np.array([round(value, 2) for value in final_price.tolist()]),
+        np.array([round(value, 2) for value in cost.tolist()])
+    )
+
+
+def _get_product_price_for_sku(sku_id: str, category_id: int = None) -> tuple:
+    """
+    Generate a consistent but varied price for a product.
     
-    return round(final_price, 2), round(cost, 2)
+    Uses hash of SKU to ensure same SKU always gets same price,
+    but different SKUs get different prices.
+    """
+    prices, costs = _get_product_prices([sku_id], [-1 if category_id is None else category_id])
+    return float(prices[0]), float(costs[0])
 
 
 def seed_prices(db: Session, default_price: float = 2.99, default_cost: float = 1.50):
@@ -88,53 +115,60 @@ def seed_prices(db: Session, default_price: float = 2.99, default_cost: float =
         return
     
     today = date.today()
-    prices_created = 0
-    costs_created = 0
     
-    for product in products:
-        # Generate varied price based on SKU and category
-        category_id = product.category_id if product.category_id else 0
-        product_price, product_cost = _get_product_price_for_sku(product.sku_id, category_id)
-        
-        # Check if product already has a current price
-        existing_price = db.query(ProductPrice).filter(
-            ProductPrice.product_id == product.id,
-            ProductPrice.end_date.is_(None)
-        ).first()
-        
-        if existing_price:
+    # Current price/cost row per product, fetched in one query each
+    existing_prices = {}
+    for price_id, product_id in db.query(ProductPrice.id, ProductPrice.product_id).filter(
+        ProductPrice.end_date.is_(None)
+    ):
+        existing_prices.setdefault(product_id, price_id)
+    
+    existing_costs = {}
+    for cost_id, product_id in db.query(ProductCost.id, ProductCost.product_id).filter(
+        ProductCost.end_date.is_(None)
+    ):
+        existing_costs.setdefault(product_id, cost_id)
+    
+    # Generate varied prices based on SKU and category for all products at once
+    product_prices, product_costs = _get_product_prices(
+        [product.sku_id for product in products],
+        [product.category_id if product.category_id else 0 for product in products]
+    )
+    
+    new_prices, updated_prices = [], []
+    new_costs, updated_costs = [], []
+    
+    for product, product_price, product_cost in zip(products, product_prices.tolist(), product_costs.tolist()):
+        if product.id in existing_prices:
             # Update existing price to varied price
-            existing_price.price = product_price
+            updated_prices.append({'id': existing_prices[product.id], 'price': product_price})
         else:
-            # Create new price
-            price = ProductPrice(
-                product_id=product.id,
-                price=product_price,
-                effective_date=today,
-                end_date=None  # Current price
-            )
-            db.add(price)
-            prices_created += 1
-        
-        # Check if product already has a current cost
-        existing_cost = db.query(ProductCost).filter(
-            ProductCost.product_id == product.id,
-            ProductCost.end_date.is_(None)
-        ).first()
+            # Create new price (no end date = current price)
+            new_prices.append({
+                'product_id': product.id,
+                'price': product_price,
+                'effective_date': today,
+                'end_date': None
+            })
         
-        if existing_cost:
+        if product.id in existing_costs:
             # Update existing cost
-            existing_cost.cost_per_unit = product_cost
+            updated_costs.append({'id': existing_costs[product.id], 'cost_per_unit': product_cost})
         else:
-            # Create new cost
-            cost = ProductCost(
-                product_id=product.id,
-                cost_per_unit=product_cost,
-                effective_date=today,
-                end_date=None  # Current cost
-            )
-            db.add(cost)
-            costs_created += 1
+            # Create new cost (no end date = current cost)
+            new_costs.append({
+                'product_id': product.id,
+                'cost_per_unit': product_cost,
+                'effective_date': today,
+                'end_date': None
+            })
+    
+    db.bulk_insert_mappings(ProductPrice, new_prices)
+    db.bulk_update_mappings(ProductPrice, updated_prices)
+    db.bulk_insert_mappings(ProductCost, new_costs)
+    db.bulk_update_mappings(ProductCost, updated_costs)
+    prices_created = len(new_prices)
+    costs_created = len(new_costs)
     
     db.commit()
     logger.info(f"Created/updated {prices_created} prices and {costs_created} costs for {len(products)} products")
@@ -10,21 +10,32 @@ This script populates the database with data derived from FreshRetailNet-50K:
 - Recommendations (based on inventory state)
 """
 
+import argparse
+import csv
+import io
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date, datetime, timedelta
-import random
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy.orm import Session
-from services.api_gateway.database import get_db, init_db, SessionLocal
+from sqlalchemy import Text, delete, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+from services.api_gateway.database import get_db, init_db, engine
 from services.api_gateway.models import (
     Store, Product, InventorySnapshot, Forecast, Recommendation, User
 )
-from services.api_gateway.auth import get_password_hash
 from shared.logging_setup import get_logger
 from shared.category_shelf_life import get_category_name, get_shelf_life
 
@@ -41,111 +52,202 @@ STORE_CONFIG = {
     "freshretail_store_id": 235  # Maps to actual FreshRetailNet store
 }
 
+# Rows per bulk INSERT page, so large seeds never build one huge statement
+# or parameter list
+INSERT_PAGE_SIZE = 5000
+
+# Sessions for seeding: no autoflush, and objects keep their loaded attributes
+# after commit (products are handed to another thread once committed)
+SeedSession = sessionmaker(
+    bind=engine.execution_options(insertmanyvalues_page_size=INSERT_PAGE_SIZE),
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Seeded generator for reproducible test data
+rng = np.random.default_rng(42)
+
+# Markdown discount (%) indexed by days until expiry, clamped to 0-3
+MARKDOWN_DISCOUNT_BY_DAYS = np.array([50.0, 50.0, 35.0, 25.0])
+
+# Forecast demand multipliers by weekday (Mon=0); other days vary randomly
+DOW_DEMAND_MULTIPLIERS = {
+    0: 0.85,  # Monday
+    4: 1.10,  # Friday
+    5: 1.30,  # Saturday
+    6: 1.15,  # Sunday
+}
+
+
+def _upsert_insert(db: Session, model):
+    """Build an INSERT for model that supports ON CONFLICT clauses."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return pg_insert(model)
+    if dialect == "sqlite":
+        return sqlite_insert(model)
+    raise ValueError(f"Unsupported database dialect for seeding: {dialect}")
+
 
 def create_test_users(db: Session):
     """Create test users if they don't exist."""
-    users_created = 0
-    
-    # Test user (store manager)
-    if not db.query(User).filter(User.username == "test_user").first():
-        user = User(
-            username="test_user",
-            email="test@example.com",
-            hashed_password=get_password_hash("test123"),
-            role="store_manager",
-            store_id=235,
-            is_active=True
-        )
-        db.add(user)
-        users_created += 1
-        print(f"  Created user: test_user (password: test123)")
-    
-    # Admin user
-    if not db.query(User).filter(User.username == "admin").first():
-        admin = User(
-            username="admin",
-            email="admin@example.com",
-            hashed_password=get_password_hash("admin123"),
-            role="admin",
-            store_id=235,
-            is_active=True
+    # Password hashes are precomputed (bcrypt, cost 12) so seeding does no
+    # hashing work; they verify against the passwords listed alongside
+    test_users = [
+        {
+            "username": "test_user",
+            "email": "test@example.com",
+            "password": "test123",
+            "hashed_password": "$2b$12$pAMs7EjLhQ9D6zt4hyapAuORbR6sgYtrtIFJxM9q3WMVIdv2.3ChC",
+            "role": "store_manager",
+        },
+        {
+            "username": "admin",
+            "email": "admin@example.com",
+            "password": "admin123",
+            "hashed_password": "$2b$12$tZraqVZ8BbbHpKuhJG0wEOPNEqc51Yx1yxD57G8hVpgNydMmxuDCW",
+            "role": "admin",
+        },
+    ]
+    
+    # Look up existing usernames first so only missing users are inserted
+    existing = {
+        username for username in db.scalars(
+            select(User.username).where(
+                User.username.in_([u["username"] for u in test_users])
+            )
         )
-        db.add(admin)
-        users_created += 1
-        print(f"  Created user: admin (password: admin123)")
+    }
+    missing = [u for u in test_users if u["username"] not in existing]
+    if not missing:
+        return 0
     
-    db.commit()
-    return users_created
+    # Idempotent even if another seeder created the users concurrently
+    result = db.execute(
+        _upsert_insert(db, User).values([
+            {
+                "username": u["username"],
+                "email": u["email"],
+                "hashed_password": u["hashed_password"],
+                "role": u["role"],
+                "store_id": 235,
+                "is_active": True,
+            }
+            for u in missing
+        ]).on_conflict_do_nothing(index_elements=["username"])
+    )
+    for u in missing:
+        print(f"  Created user: {u['username']} (password: {u['password']})")
+    return result.rowcount
 
 
 def seed_store(db: Session):
     """Seed the store."""
-    if not db.query(Store).filter(Store.id == STORE_CONFIG["id"]).first():
-        store = Store(
+    result = db.execute(
+        _upsert_insert(db, Store).values(
             id=STORE_CONFIG["id"],
             store_id=str(STORE_CONFIG["id"]),
             name=STORE_CONFIG["name"]
-        )
-        db.add(store)
-        db.commit()
-        print(f"  Created store: {store.name} (ID: {store.id})")
-        return 1
-    return 0
+        ).on_conflict_do_nothing(index_elements=["id"])
+    )
+    if result.rowcount:
+        print(f"  Created store: {STORE_CONFIG['name']} (ID: {STORE_CONFIG['id']})")
+    return result.rowcount
 
 
 def seed_products_from_freshretail(db: Session, inventory_generator: InventoryGenerator, store_id: int = 235):
-    """Seed products from FreshRetailNet-50K dataset."""
-    products_created = 0
-    products_updated = 0
+    """Seed products from FreshRetailNet-50K dataset.
     
+    Returns:
+        The seeded Product rows, for reuse by later seeding stages
+    """
     # Get products that have sales in the dataset for this store
     freshretail_products = inventory_generator.get_products_for_store(
         store_id=store_id,
         limit=50  # Top 50 products by sales volume
     )
+    if not freshretail_products:
+        print("  Created or updated 0 products")
+        return []
+    case_pack_sizes = rng.integers(6, 25, size=len(freshretail_products)).tolist()
     
-    for prod_info in freshretail_products:
-        sku_id = prod_info['sku_id']
-        existing = db.query(Product).filter(Product.sku_id == sku_id).first()
-        
-        if existing:
-            # Update existing product
-            existing.category = prod_info['category_name']
-            existing.category_id = prod_info['category_id']
-            existing.shelf_life_days = prod_info['shelf_life_days']
-            products_updated += 1
-        else:
-            # Create new product
-            product = Product(
-                sku_id=sku_id,
-                name=f"{prod_info['category_name']} #{sku_id}",
-                category=prod_info['category_name'],
-                category_id=prod_info['category_id'],
-                shelf_life_days=prod_info['shelf_life_days'],
-                transit_days=1 if prod_info['shelf_life_days'] <= 3 else 2,
-                case_pack_size=random.randint(6, 24),
-                min_order_quantity=1,
-                max_order_quantity=500
-            )
-            db.add(product)
-            products_created += 1
+    product_rows = [
+        {
+            "sku_id": prod_info['sku_id'],
+            "name": f"{prod_info['category_name']} #{prod_info['sku_id']}",
+            "category": prod_info['category_name'],
+            "category_id": prod_info['category_id'],
+            "shelf_life_days": prod_info['shelf_life_days'],
+            "transit_days": 1 if prod_info['shelf_life_days'] <= 3 else 2,
+            "case_pack_size": case_pack_size,
+            "min_order_quantity": 1,
+            "max_order_quantity": 500
+        }
+        for prod_info, case_pack_size in zip(freshretail_products, case_pack_sizes)
+    ]
+    
+    # Insert new products and refresh the category fields of existing ones
+    # in a single upsert keyed on sku_id
+    stmt = _upsert_insert(db, Product).values(product_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["sku_id"],
+        set_={
+            "category": stmt.excluded.category,
+            "category_id": stmt.excluded.category_id,
+            "shelf_life_days": stmt.excluded.shelf_life_days,
+            "updated_at": datetime.utcnow()
+        }
+    )
+    db.execute(stmt)
+    
+    # Load the seeded rows (with their ids) in the dataset's order
+    sku_ids = [row["sku_id"] for row in product_rows]
+    by_sku = {
+        product.sku_id: product
+        for product in db.scalars(
+            select(Product).where(Product.sku_id.in_(sku_ids)),
+            execution_options={"populate_existing": True}
+        )
+    }
+    products = [by_sku[sku_id] for sku_id in sku_ids]
     
-    db.commit()
-    print(f"  Created {products_created} products, updated {products_updated}")
-    return products_created + products_updated
+    print(f"  Created or updated {len(products)} products")
+    return products
 
 
-def seed_inventory_from_sales(db: Session, inventory_generator: InventoryGenerator, store_id: int = 235):
-    """Seed inventory derived from FreshRetailNet sales patterns."""
+def clear_todays_data(db: Session, store_id: int = 235):
+    """Delete today's inventory, forecasts and recommendations before reseeding."""
     today = date.today()
-    inventory_created = 0
     
-    # Delete existing inventory for today
-    db.query(InventorySnapshot).filter(
-        InventorySnapshot.store_id == store_id,
-        InventorySnapshot.snapshot_date == today
-    ).delete()
-    db.commit()
+    # Plain Core DELETEs; the session holds none of these rows yet
+    for statement in (
+        delete(InventorySnapshot).where(
+            InventorySnapshot.store_id == store_id,
+            InventorySnapshot.snapshot_date == today
+        ),
+        delete(Forecast).where(
+            Forecast.store_id == store_id,
+            Forecast.forecast_date == today
+        ),
+        delete(Recommendation).where(
+            Recommendation.store_id == store_id,
+            Recommendation.recommendation_date == today
+        ),
+    ):
+        db.execute(statement, execution_options={"synchronize_session": False})
+
+
+def seed_inventory_from_sales(
+    db: Session,
+    inventory_generator: InventoryGenerator,
+    store_id: int = 235,
+    products: Optional[List[Product]] = None
+):
+    """Seed inventory derived from FreshRetailNet sales patterns.
+    
+    Uses the given products, or all products in the database if omitted.
+    """
+    today = date.today()
     
     # Generate inventory from sales data
     inventory_items = inventory_generator.generate_store_inventory(
@@ -155,97 +257,182 @@ def seed_inventory_from_sales(db: Session, inventory_generator: InventoryGenerat
     )
     
     # Get product ID mapping (sku_id -> db product.id)
-    products = db.query(Product).all()
+    if products is None:
+        products = db.scalars(select(Product)).all()
     product_id_map = {p.sku_id: p.id for p in products}
     
-    for item in inventory_items:
-        db_product_id = product_id_map.get(item['sku_id'])
-        if not db_product_id:
-            continue
-        
-        inventory = InventorySnapshot(
-            store_id=store_id,
-            product_id=db_product_id,
-            snapshot_date=item['snapshot_date'],
-            quantity=item['quantity'],
-            shelf_quantity=item['shelf_quantity'],
-            backroom_quantity=item['backroom_quantity'],
-            expiry_date=item['expiry_date'],
-            days_until_expiry=item['days_until_expiry'],
-            expiry_buckets=item['expiry_buckets'],
-            in_transit=item['in_transit'],
-            to_discard=item['to_discard'],
-            sold_today=item['sold_today']
-        )
-        db.add(inventory)
-        inventory_created += 1
+    # Build the snapshot rows as one frame, keeping only generated items
+    # whose product exists in the database
+    columns = [
+        'snapshot_date', 'quantity', 'shelf_quantity', 'backroom_quantity',
+        'expiry_date', 'days_until_expiry', 'expiry_buckets',
+        'in_transit', 'to_discard', 'sold_today'
+    ]
+    items_df = pd.DataFrame(inventory_items, columns=['sku_id'] + columns)
+    items_df.insert(0, 'product_id', items_df['sku_id'].map(product_id_map))
+    items_df = items_df.dropna(subset=['product_id']).drop(columns=['sku_id'])
+    items_df['product_id'] = items_df['product_id'].astype(int)
+    items_df.insert(0, 'store_id', store_id)
+    items_df['created_at'] = datetime.utcnow()
+    
+    # Serialize expiry buckets up front with orjson and insert the JSON text
+    # directly, instead of per-row serialization by the JSON column type
+    items_df['expiry_buckets'] = [
+        orjson.dumps(buckets).decode() for buckets in items_df['expiry_buckets']
+    ]
     
-    db.commit()
+    # Multi-row INSERTs on the session's connection, so the rows stay in the
+    # seeding transaction; other column types come from the model
+    table = InventorySnapshot.__table__
+    column_types = {col: table.c[col].type for col in items_df.columns}
+    column_types['expiry_buckets'] = Text()
+    items_df.to_sql(
+        table.name,
+        db.connection(),
+        if_exists='append',
+        index=False,
+        method='multi',
+        chunksize=1000,
+        dtype=column_types
+    )
+    inventory_created = len(items_df)
     print(f"  Created {inventory_created} inventory records from sales data")
     return inventory_created
 
 
-def seed_forecasts(db: Session, inventory_generator: InventoryGenerator, store_id: int = 235):
-    """Seed forecasts based on actual demand patterns."""
-    today = date.today()
-    forecasts_created = 0
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most size rows."""
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _copy_rows(db: Session, table, rows: List[dict]):
+    """Load rows into a table with PostgreSQL COPY FROM STDIN (psycopg2).
     
-    # Delete old forecasts for today
-    db.query(Forecast).filter(
-        Forecast.store_id == store_id,
-        Forecast.forecast_date == today
-    ).delete()
-    db.commit()
+    Runs on the session's connection, inside its transaction. None values
+    are written as empty CSV fields, which COPY reads as NULL.
+    """
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([row[col] for col in columns] for row in rows)
+    buffer.seek(0)
+    
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH CSV",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def seed_forecasts(
+    db: Session,
+    inventory_generator: InventoryGenerator,
+    store_id: int = 235,
+    products: Optional[List[Product]] = None,
+    rebuild_indexes: bool = False
+):
+    """Seed forecasts based on actual demand patterns.
+    
+    Uses the given products, or all products in the database if omitted.
+    With rebuild_indexes, the forecast table's indexes are dropped for the
+    bulk load and built again afterwards.
+    """
+    today = date.today()
     
     # Get products with their demand data
-    products = db.query(Product).all()
+    if products is None:
+        products = db.scalars(select(Product)).all()
     
-    for product in products:
-        # Calculate actual average demand from sales data
-        avg_demand = inventory_generator.calculate_daily_demand(
-            store_id=store_id,
-            product_id=int(product.sku_id) if product.sku_id.isdigit() else 0
-        )
-        
-        if avg_demand <= 0:
-            # Use fallback for products not in dataset
-            avg_demand = random.uniform(10, 30)
-        
-        # Create forecasts for next 30 days
-        for day_offset in range(1, 31):
-            target_date = today + timedelta(days=day_offset)
-            
-            # Apply day-of-week variation based on patterns
-            dow = target_date.weekday()
-            if dow == 5:  # Saturday
-                demand = avg_demand * 1.30
-            elif dow == 6:  # Sunday
-                demand = avg_demand * 1.15
-            elif dow == 4:  # Friday
-                demand = avg_demand * 1.10
-            elif dow == 0:  # Monday
-                demand = avg_demand * 0.85
-            else:
-                demand = avg_demand * random.uniform(0.95, 1.05)
-            
-            # Add small random variation
-            demand = demand * random.uniform(0.92, 1.08)
-            
-            forecast = Forecast(
+    # Dataset product IDs (non-numeric SKUs are not in the dataset)
+    dataset_product_ids = [
+        int(product.sku_id) if product.sku_id.isdigit() else 0
+        for product in products
+    ]
+    
+    # Calculate actual average demand from sales data
+    avg_demand = np.fromiter(
+        (
+            inventory_generator.calculate_daily_demand(
                 store_id=store_id,
-                product_id=product.id,
-                forecast_date=today,
-                target_date=target_date,
-                predicted_demand=round(demand, 2),
-                lower_bound=round(demand * 0.85, 2),
-                upper_bound=round(demand * 1.15, 2),
-                model_type="lightgbm",
-                confidence_level=0.95
+                product_id=dataset_product_id
             )
-            db.add(forecast)
-            forecasts_created += 1
+            for dataset_product_id in dataset_product_ids
+        ),
+        dtype=np.float64,
+        count=len(products)
+    )
+    
+    # Use fallback for products not in dataset
+    avg_demand = np.where(
+        avg_demand <= 0, rng.uniform(10, 30, len(products)), avg_demand
+    )
+    
+    # Create forecasts for next 30 days
+    target_dates = [today + timedelta(days=day_offset) for day_offset in range(1, 31)]
+    
+    # Apply day-of-week variation based on patterns; midweek days get a
+    # random factor per product instead of a fixed one
+    dow_multiplier = np.array([
+        DOW_DEMAND_MULTIPLIERS.get(target_date.weekday(), np.nan)
+        for target_date in target_dates
+    ])
+    multipliers = np.where(
+        np.isnan(dow_multiplier),
+        rng.uniform(0.95, 1.05, (len(products), len(target_dates))),
+        dow_multiplier
+    )
     
-    db.commit()
+    # Add small random variation
+    demand = avg_demand[:, None] * multipliers * rng.uniform(
+        0.92, 1.08, (len(products), len(target_dates))
+    )
+    predicted = np.round(demand, 2).tolist()
+    lower = np.round(demand * 0.85, 2).tolist()
+    upper = np.round(demand * 1.15, 2).tolist()
+    
+    # Fields shared by every forecast row
+    row_template = {
+        "store_id": store_id,
+        "forecast_date": today,
+        "model_type": "lightgbm",
+        "confidence_level": 0.95,
+        "created_at": datetime.utcnow()
+    }
+    forecast_rows = [
+        {
+            **row_template,
+            "product_id": product.id,
+            "target_date": target_date,
+            "predicted_demand": predicted[i][j],
+            "lower_bound": lower[i][j],
+            "upper_bound": upper[i][j]
+        }
+        for i, product in enumerate(products)
+        for j, target_date in enumerate(target_dates)
+    ]
+    
+    forecast_indexes = Forecast.__table__.indexes if rebuild_indexes else set()
+    for index in forecast_indexes:
+        index.drop(db.connection())
+    
+    # Load all forecasts with COPY on PostgreSQL (psycopg2), otherwise in
+    # batched multi-row INSERTs
+    bind = db.get_bind()
+    if forecast_rows and bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+        _copy_rows(db, Forecast.__table__, forecast_rows)
+    else:
+        for page in _chunks(forecast_rows, INSERT_PAGE_SIZE):
+            db.bulk_insert_mappings(Forecast, page)
+    
+    # Build each index once over the loaded table
+    for index in forecast_indexes:
+        index.create(db.connection())
+    db.flush()
+    forecasts_created = len(forecast_rows)
     print(f"  Created {forecasts_created} forecasts (30 days x {len(products)} products)")
     return forecasts_created
 
@@ -256,24 +443,18 @@ def seed_recommendations(db: Session, store_id: int = 235):
     recs_created = 0
     markdown_recs = 0
     
-    # Delete existing recommendations for today
-    db.query(Recommendation).filter(
-        Recommendation.store_id == store_id,
-        Recommendation.recommendation_date == today
-    ).delete()
-    db.commit()
-    
-    # Get inventory with products
-    inventory_items = db.query(InventorySnapshot).filter(
-        InventorySnapshot.store_id == store_id,
-        InventorySnapshot.snapshot_date == today
+    # Get inventory with products in a single joined query
+    inventory_items = db.execute(
+        select(InventorySnapshot, Product).join(
+            Product, Product.id == InventorySnapshot.product_id
+        ).where(
+            InventorySnapshot.store_id == store_id,
+            InventorySnapshot.snapshot_date == today
+        )
     ).all()
     
-    for inv in inventory_items:
-        product = db.query(Product).filter(Product.id == inv.product_id).first()
-        if not product:
-            continue
-        
+    recommendation_rows = []
+    for inv, product in inventory_items:
         # Calculate if we need to reorder
         backroom_qty = inv.backroom_quantity or 0
         shelf_qty = inv.shelf_quantity or 0
@@ -283,46 +464,85 @@ def seed_recommendations(db: Session, store_id: int = 235):
         # ORDER recommendation if backroom is low
         if backroom_qty < forecasted_demand * 3:
             order_qty = max(30, int(forecasted_demand * 7))
-            recommendation = Recommendation(
-                store_id=store_id,
-                product_id=product.id,
-                recommendation_date=today,
-                order_quantity=float(order_qty),
-                status="pending"
-            )
-            db.add(recommendation)
+            recommendation_rows.append({
+                "store_id": store_id,
+                "product_id": product.id,
+                "recommendation_date": today,
+                "order_quantity": float(order_qty),
+                "markdown_discount_percent": None,
+                "markdown_effective_date": None,
+                "markdown_reason": None,
+                "status": "pending"
+            })
             recs_created += 1
         
         # MARKDOWN recommendation if expiring soon
         if days_until_exp <= 3 and inv.quantity > 0:
-            if days_until_exp <= 1:
-                discount = 50.0
-            elif days_until_exp <= 2:
-                discount = 35.0
-            else:
-                discount = 25.0
+            discount = float(MARKDOWN_DISCOUNT_BY_DAYS[min(max(days_until_exp, 0), 3)])
             
-            markdown_rec = Recommendation(
-                store_id=store_id,
-                product_id=product.id,
-                recommendation_date=today,
-                order_quantity=0.0,
-                markdown_discount_percent=discount,
-                markdown_effective_date=today,
-                markdown_reason=f"Expiring in {days_until_exp} day(s) - reduce price to clear stock",
-                status="pending"
-            )
-            db.add(markdown_rec)
+            recommendation_rows.append({
+                "store_id": store_id,
+                "product_id": product.id,
+                "recommendation_date": today,
+                "order_quantity": 0.0,
+                "markdown_discount_percent": discount,
+                "markdown_effective_date": today,
+                "markdown_reason": f"Expiring in {days_until_exp} day(s) - reduce price to clear stock",
+                "status": "pending"
+            })
             markdown_recs += 1
     
-    db.commit()
+    # One executemany INSERT (insertmanyvalues) for all recommendations; every
+    # row carries the same keys and NULLs are rendered so the rows are not
+    # split into separate batches
+    if recommendation_rows:
+        db.execute(
+            insert(Recommendation).execution_options(render_nulls=True),
+            recommendation_rows
+        )
+    db.flush()
     print(f"  Created {recs_created} order recommendations")
     print(f"  Created {markdown_recs} markdown recommendations")
     return recs_created + markdown_recs
 
 
-def main():
-    """Main seeding function."""
+def _configure_seed_session(db: Session):
+    """On SQLite, skip per-write syncs and keep the journal and temp tables in memory.
+    
+    Only used by this seed script; these settings trade durability for speed.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(text("PRAGMA synchronous=OFF"))
+        db.execute(text("PRAGMA journal_mode=MEMORY"))
+        db.execute(text("PRAGMA temp_store=MEMORY"))
+
+
+def _run_in_own_session(seed_func, *args, **kwargs):
+    """Run a seeding stage in a dedicated session and commit it.
+    
+    Sessions are not thread-safe, so each concurrently running stage
+    gets its own.
+    """
+    db = SeedSession()
+    try:
+        _configure_seed_session(db)
+        result = seed_func(db, *args, **kwargs)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main(fast_reseed: bool = False):
+    """Main seeding function.
+    
+    Args:
+        fast_reseed: Drop the forecast indexes during the forecast bulk load
+            and rebuild them afterwards
+    """
     print("\n" + "="*60)
     print("  Database Seeding - Fresh Product Replenishment Manager")
     print("  Using FreshRetailNet-50K Sales Data")
@@ -344,9 +564,15 @@ def main():
         print(f"[ERROR] Failed to load dataset: {e}")
         return
     
-    db = SessionLocal()
+    db = SeedSession()
     
     try:
+        # Stages 1-4 share one transaction, committed before the independent
+        # forecast and recommendation stages run concurrently
+        _configure_seed_session(db)
+        
+        clear_todays_data(db, store_id=235)
+        
         print("[1/6] Creating users...")
         create_test_users(db)
         
@@ -354,16 +580,26 @@ def main():
         seed_store(db)
         
         print("\n[3/6] Creating products from FreshRetailNet...")
-        seed_products_from_freshretail(db, inventory_generator, store_id=235)
+        products = seed_products_from_freshretail(db, inventory_generator, store_id=235)
         
         print("\n[4/6] Creating inventory from sales patterns...")
-        seed_inventory_from_sales(db, inventory_generator, store_id=235)
+        seed_inventory_from_sales(db, inventory_generator, store_id=235, products=products)
         
-        print("\n[5/6] Creating forecasts from demand data...")
-        seed_forecasts(db, inventory_generator, store_id=235)
+        db.commit()
         
-        print("\n[6/6] Creating recommendations...")
-        seed_recommendations(db, store_id=235)
+        print("\n[5/6] Creating forecasts from demand data...")
+        print("[6/6] Creating recommendations...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            forecasts = executor.submit(
+                _run_in_own_session, seed_forecasts,
+                inventory_generator, store_id=235, products=products,
+                rebuild_indexes=fast_reseed
+            )
+            recommendations = executor.submit(
+                _run_in_own_session, seed_recommendations, store_id=235
+            )
+            forecasts.result()
+            recommendations.result()
         
         print("\n" + "="*60)
         print("  Seeding Complete!")
@@ -388,4 +624,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Seed test data for development and testing.")
+    parser.add_argument(
+        "--fast-reseed",
+        action="store_true",
+        help="Drop forecast indexes during the bulk load and rebuild them afterwards"
+    )
+    args = parser.parse_args()
+    main(fast_reseed=args.fast_reseed)
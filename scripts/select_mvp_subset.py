@@ -11,7 +11,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import pandas as pd
+import polars as pl
 from shared.config import get_config
 from shared.logging_setup import setup_logging, get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
@@ -46,9 +46,10 @@ def select_mvp_subset(
     
     # Use train split (adjust as needed)
     train_split = list(dataset.keys())[0]  # Get first split
-    df = dataset[train_split].to_pandas()
+    # Wrap the underlying Arrow table instead of materializing a pandas copy
+    df = pl.from_arrow(dataset[train_split].data.table)
     
-    logger.info("Dataset loaded", shape=df.shape, columns=list(df.columns))
+    logger.info("Dataset loaded", shape=df.shape, columns=df.columns)
     
     # Use column mappings from auto-mapping
     store_col = COLUMN_MAPPINGS.get('store_id', 'store_id')
@@ -72,9 +73,9 @@ def select_mvp_subset(
         return
     
     # Basic statistics
-    num_stores = df[store_col].nunique()
-    num_skus = df[sku_col].nunique()
-    num_categories = df[category_col].nunique() if category_col in df.columns else 0
+    num_stores = df[store_col].n_unique()
+    num_skus = df[sku_col].n_unique()
+    num_categories = df[category_col].n_unique() if category_col in df.columns else 0
     
     print(f"\nDataset Statistics:")
     print(f"  Total stores: {num_stores}")
@@ -84,43 +85,46 @@ def select_mvp_subset(
     
     # Filter by categories if specified
     if categories and category_col in df.columns:
-        df_filtered = df[df[category_col].isin(categories)].copy()
+        df_filtered = df.filter(pl.col(category_col).is_in(categories))
         print(f"\nAfter filtering by categories {categories}:")
-        print(f"  Stores: {df_filtered[store_col].nunique()}")
-        print(f"  SKUs: {df_filtered[sku_col].nunique()}")
+        print(f"  Stores: {df_filtered[store_col].n_unique()}")
+        print(f"  SKUs: {df_filtered[sku_col].n_unique()}")
     else:
-        df_filtered = df.copy()
+        df_filtered = df
     
     # Select stores with most data
-    store_stats = df_filtered.groupby(store_col).agg({
-        sku_col: 'nunique',
-        sales_col: 'sum'
-    }).reset_index()
-    store_stats.columns = [store_col, 'num_skus', 'total_sales']
-    
-    # Filter stores with minimum SKUs
-    store_stats = store_stats[store_stats['num_skus'] >= min_skus_per_store]
-    
-    # Sort by total sales and select top stores
-    store_stats = store_stats.sort_values('total_sales', ascending=False)
-    selected_stores = store_stats.head(max_stores)[store_col].tolist()
+    # Keep stores with the minimum SKU count, sorted by total sales
+    top_stores = (
+        df_filtered.group_by(store_col)
+        .agg([
+            pl.col(sku_col).n_unique().alias('num_skus'),
+            pl.col(sales_col).sum().alias('total_sales'),
+        ])
+        .filter(pl.col('num_skus') >= min_skus_per_store)
+        .sort('total_sales', descending=True)
+        .head(max_stores)
+    )
+    selected_stores = top_stores[store_col].to_list()
     
     print(f"\nSelected Stores (top {len(selected_stores)} by sales):")
-    for store in selected_stores:
-        store_info = store_stats[store_stats[store_col] == store].iloc[0]
-        print(f"  {store}: {store_info['num_skus']} SKUs, {store_info['total_sales']:.0f} total sales")
+    for store_info in top_stores.iter_rows(named=True):
+        print(f"  {store_info[store_col]}: {store_info['num_skus']} SKUs, {store_info['total_sales']:.0f} total sales")
     
     # Get SKUs for selected stores
-    df_selected = df_filtered[df_filtered[store_col].isin(selected_stores)].copy()
-    selected_skus = df_selected[sku_col].unique().tolist()
+    df_selected = df_filtered.filter(pl.col(store_col).is_in(selected_stores))
+    selected_skus = df_selected[sku_col].unique(maintain_order=True).to_list()
     
     print(f"\nSelected SKUs: {len(selected_skus)}")
     
     # Category distribution
     if category_col in df_selected.columns:
-        category_dist = df_selected.groupby(category_col)[sku_col].nunique().sort_values(ascending=False)
+        category_dist = (
+            df_selected.group_by(category_col)
+            .agg(pl.col(sku_col).n_unique().alias('num_skus'))
+            .sort('num_skus', descending=True)
+        )
         print(f"\nCategory Distribution:")
-        for cat, count in category_dist.items():
+        for cat, count in category_dist.iter_rows():
             print(f"  {cat}: {count} SKUs")
     
     # Save selection to file
@@ -148,8 +152,8 @@ def select_mvp_subset(
     print(f"\n✅ Selection saved to {info_path}")
     
     # Save selected data sample
-    sample_path = output_dir / "mvp_subset_sample.csv"
-    df_selected.head(1000).to_csv(sample_path, index=False)
+    sample_path = output_dir / "mvp_subset_sample.parquet"
+    df_selected.head(1000).write_parquet(sample_path, compression="zstd")
     print(f"✅ Sample data saved to {sample_path}")
     
     logger.info(
@@ -1,12 +1,40 @@
 """Show that the app uses REAL data, not mock data."""
 
+import asyncio
 import sys
+from datetime import date
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
 from services.api_gateway.database import SessionLocal
 from services.api_gateway.models import Product, InventorySnapshot, Forecast, ProductPrice, User, Store
-import requests
+
+async def fetch_weather(http: httpx.AsyncClient) -> dict:
+    """Fetch a 3-day temperature forecast for NYC from Open-Meteo."""
+    r = await http.get("https://api.open-meteo.com/v1/forecast", params={
+        "latitude": 40.7128,
+        "longitude": -74.0060,
+        "daily": "temperature_2m_max,temperature_2m_min",
+        "timezone": "auto",
+        "forecast_days": 3
+    })
+    return r.json()
+
+async def fetch_holidays(http: httpx.AsyncClient) -> list:
+    """Fetch 2025 US public holidays from Nager.Date."""
+    r = await http.get("https://date.nager.at/api/v3/PublicHolidays/2025/US")
+    return r.json()
+
+async def fetch_external_data() -> tuple:
+    """Query both APIs concurrently; failed calls come back as exceptions."""
+    async with httpx.AsyncClient(timeout=5) as http:
+        return await asyncio.gather(
+            fetch_weather(http), fetch_holidays(http), return_exceptions=True
+        )
 
 def main():
     print("=" * 60)
@@ -18,16 +46,13 @@ def main():
     print("1. EXTERNAL APIs (Real-time data):")
     print("-" * 40)
     
+    weather_result, holidays_result = asyncio.run(fetch_external_data())
+    
     # Weather
     try:
-        r = requests.get("https://api.open-meteo.com/v1/forecast", params={
-            "latitude": 40.7128,
-            "longitude": -74.0060,
-            "daily": "temperature_2m_max,temperature_2m_min",
-            "timezone": "auto",
-            "forecast_days": 3
-        }, timeout=5)
-        data = r.json()
+        if isinstance(weather_result, Exception):
+            raise weather_result
+        data = weather_result
         print("   Open-Meteo Weather API (NYC):")
         for i, d in enumerate(data["daily"]["time"]):
             print(f"     {d}: {data['daily']['temperature_2m_max'][i]}°C / {data['daily']['temperature_2m_min'][i]}°C")
@@ -36,10 +61,9 @@ def main():
     
     # Holidays
     try:
-        r = requests.get("https://date.nager.at/api/v3/PublicHolidays/2025/US", timeout=5)
-        holidays = r.json()
-        from datetime import date
-        upcoming = [h for h in holidays if h["date"] >= str(date.today())][:3]
+        if isinstance(holidays_result, Exception):
+            raise holidays_result
+        upcoming = [h for h in holidays_result if h["date"] >= str(date.today())][:3]
         print("   Nager.Date Holiday API (US):")
         for h in upcoming:
             print(f"     {h['date']}: {h['localName']}")
@@ -54,12 +78,18 @@ def main():
     
     db = SessionLocal()
     
-    print(f"   Users:           {db.query(User).count()}")
-    print(f"   Stores:          {db.query(Store).count()}")
-    print(f"   Products:        {db.query(Product).count()}")
-    print(f"   Inventory:       {db.query(InventorySnapshot).count()}")
-    print(f"   Forecasts:       {db.query(Forecast).count()}")
-    print(f"   Prices:          {db.query(ProductPrice).count()}")
+    # All table counts in a single round trip
+    counts = db.execute(select(*(
+        select(func.count()).select_from(model).scalar_subquery()
+        for model in (User, Store, Product, InventorySnapshot, Forecast, ProductPrice)
+    ))).one()
+    
+    print(f"   Users:           {counts[0]}")
+    print(f"   Stores:          {counts[1]}")
+    print(f"   Products:        {counts[2]}")
+    print(f"   Inventory:       {counts[3]}")
+    print(f"   Forecasts:       {counts[4]}")
+    print(f"   Prices:          {counts[5]}")
     
     print()
     print("   Sample Products with VARIED prices:")
@@ -70,9 +100,12 @@ def main():
     
     print()
     print("   Sample Inventory with Shelf/Backroom split:")
-    for inv in db.query(InventorySnapshot).limit(5).all():
-        p = db.query(Product).filter(Product.id == inv.product_id).first()
-        name = p.name if p else "Unknown"
+    # Load each snapshot's product in the same query
+    inventory = db.query(InventorySnapshot).options(
+        joinedload(InventorySnapshot.product)
+    ).limit(5).all()
+    for inv in inventory:
+        name = inv.product.name if inv.product else "Unknown"
         print(f"     {name}: Shelf={inv.shelf_quantity}, Backroom={inv.backroom_quantity}")
         if inv.expiry_buckets:
             print(f"       Expiring: {inv.expiry_buckets}")
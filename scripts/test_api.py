@@ -1,58 +1,68 @@
 """Test the API endpoints."""
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import json
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# One pooled session for all calls, so connections are kept alive
+SESSION = requests.Session()
+
 def login():
-    resp = requests.post(f"{BASE_URL}/api/v1/auth/login", data={"username": "test_user", "password": "test123"})
+    resp = SESSION.post(f"{BASE_URL}/api/v1/auth/login", data={"username": "test_user", "password": "test123"})
     if resp.status_code == 200:
-        return resp.json()["access_token"]
+        token = resp.json()["access_token"]
+        SESSION.headers.update({"Authorization": f"Bearer {token}"})
+        return token
     print(f"Login error: {resp.status_code} - {resp.text}")
     return None
 
-def test_products(token):
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(f"{BASE_URL}/api/v1/stores/235/products", headers=headers)
+def test_products():
+    resp = SESSION.get(f"{BASE_URL}/api/v1/stores/235/products")
+    lines = []
     if resp.status_code == 200:
         products = resp.json()[:5]
-        print("\n=== PRODUCTS ===")
+        lines.append("\n=== PRODUCTS ===")
         for p in products:
-            print(f"  {p['name']}")
-            print(f"    Category: {p['category']}")
-            print(f"    Stock: {p['current_stock']}")
-            print(f"    Sold Today: {p['items_sold_today']}")
-            print(f"    Expiry: {p['expiry_date']}")
-            print(f"    Days Until Expiry: {p['days_until_expiry']}")
+            lines.append(f"  {p['name']}")
+            lines.append(f"    Category: {p['category']}")
+            lines.append(f"    Stock: {p['current_stock']}")
+            lines.append(f"    Sold Today: {p['items_sold_today']}")
+            lines.append(f"    Expiry: {p['expiry_date']}")
+            lines.append(f"    Days Until Expiry: {p['days_until_expiry']}")
     else:
-        print(f"Products error: {resp.status_code} - {resp.text}")
+        lines.append(f"Products error: {resp.status_code} - {resp.text}")
+    return "\n".join(lines)
 
-def test_inventory(token):
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(f"{BASE_URL}/api/v1/stores/235/inventory", headers=headers)
+def test_inventory():
+    resp = SESSION.get(f"{BASE_URL}/api/v1/stores/235/inventory")
+    lines = []
     if resp.status_code == 200:
         items = resp.json()[:5]
-        print("\n=== INVENTORY ===")
+        lines.append("\n=== INVENTORY ===")
         for item in items:
-            print(f"  {item['name']}")
-            print(f"    Category: {item['category']}")
-            print(f"    Shelf: {item['shelf_quantity']}, Backroom: {item['backroom_quantity']}")
-            print(f"    Expiry Date: {item['expiry_date']}")
-            print(f"    Days Until Expiry: {item['days_until_expiry']}")
+            lines.append(f"  {item['name']}")
+            lines.append(f"    Category: {item['category']}")
+            lines.append(f"    Shelf: {item['shelf_quantity']}, Backroom: {item['backroom_quantity']}")
+            lines.append(f"    Expiry Date: {item['expiry_date']}")
+            lines.append(f"    Days Until Expiry: {item['days_until_expiry']}")
     else:
-        print(f"Inventory error: {resp.status_code} - {resp.text}")
+        lines.append(f"Inventory error: {resp.status_code} - {resp.text}")
+    return "\n".join(lines)
 
-def test_forecast_insights(token):
-    headers = {"Authorization": f"Bearer {token}"}
-    resp = requests.get(f"{BASE_URL}/api/v1/stores/235/forecast-insights", headers=headers)
+def test_forecast_insights():
+    resp = SESSION.get(f"{BASE_URL}/api/v1/stores/235/forecast-insights")
+    lines = []
     if resp.status_code == 200:
         data = resp.json()
-        print("\n=== FORECAST INSIGHTS ===")
-        print(f"  Tomorrow: {data['tomorrow']['forecasted_items']} items, ${data['tomorrow']['forecasted_revenue']:.2f} revenue")
-        print(f"  Next Week (daily avg): {data['next_week']['daily_avg_items']} items/day")
-        print(f"  Next Month (daily avg): {data['next_month']['daily_avg_items']} items/day")
+        lines.append("\n=== FORECAST INSIGHTS ===")
+        lines.append(f"  Tomorrow: {data['tomorrow']['forecasted_items']} items, ${data['tomorrow']['forecasted_revenue']:.2f} revenue")
+        lines.append(f"  Next Week (daily avg): {data['next_week']['daily_avg_items']} items/day")
+        lines.append(f"  Next Month (daily avg): {data['next_month']['daily_avg_items']} items/day")
     else:
-        print(f"Forecast insights error: {resp.status_code} - {resp.text}")
+        lines.append(f"Forecast insights error: {resp.status_code} - {resp.text}")
+    return "\n".join(lines)
 
 def main():
     token = login()
@@ -60,9 +70,16 @@ def main():
         return
     
     print("Login successful!")
-    test_products(token)
-    test_inventory(token)
-    test_forecast_insights(token)
+    
+    # The endpoint checks are independent, so run them concurrently and
+    # print each report whole, in order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(check)
+            for check in (test_products, test_inventory, test_forecast_insights)
+        ]
+        for future in futures:
+            print(future.result())
 
 if __name__ == "__main__":
     main()
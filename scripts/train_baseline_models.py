@@ -14,20 +14,22 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import orjson
 import pandas as pd
-import numpy as np
 from datetime import timedelta
 
 from shared.config import get_config
 from shared.logging_setup import setup_logging, get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
+from shared.mvp_loader import (
+    get_mvp_file,
+    load_cached_mvp_data,
+    load_mvp_stores,
+    save_mvp_data_cache
+)
+from shared.utils import parse_dates
 from services.ingestion.datasets import load_freshretailnet_dataset
 from services.forecasting.features.aggregate_daily import aggregate_to_daily
-from services.forecasting.models.baseline import (
-    LastValueForecaster,
-    MovingAverageForecaster,
-    SeasonalNaiveForecaster
-)
 from services.forecasting.evaluators import ForecastEvaluator
 
 # Setup
@@ -35,40 +37,35 @@ setup_logging()
 logger = get_logger(__name__)
 config = get_config()
 
+# Number of prediction rows kept for the saved predictions sample
+PREDICTIONS_SAMPLE_ROWS = 1000
+
 
 def load_mvp_data():
     """Load and filter MVP subset data."""
     logger.info("Loading MVP subset data")
     
-    # Load dataset
-    dataset = load_freshretailnet_dataset()
-    df = dataset['train'].to_pandas()
-    
     # Get column mappings
     store_col = COLUMN_MAPPINGS.get('store_id', 'store_id')
     sku_col = COLUMN_MAPPINGS.get('sku_id', 'product_id')
     date_col = COLUMN_MAPPINGS.get('date_col', 'dt')
     sales_col = COLUMN_MAPPINGS.get('sales_col', 'sale_amount')
     
+    # Reuse the subset cached by a previous run if the selection is unchanged
+    df = load_cached_mvp_data()
+    if df is not None:
+        logger.info(f"Loaded cached MVP data: {len(df)} records")
+        return df, store_col, sku_col, date_col, sales_col
+    
+    # Load dataset
+    dataset = load_freshretailnet_dataset()
+    df = dataset['train'].to_pandas()
+    
     # Load MVP store list
-    mvp_file = Path(config.data.processed_path) / "mvp_selection" / "mvp_subset.txt"
+    mvp_file = get_mvp_file()
+    stores = []
     if mvp_file.exists():
-        with open(mvp_file, 'r') as f:
-            lines = f.readlines()
-        # Extract store IDs (they're listed after "Selected Stores")
-        stores = []
-        in_stores_section = False
-        for line in lines:
-            if "Selected Stores" in line:
-                in_stores_section = True
-                continue
-            if in_stores_section and line.strip() and not line.strip().startswith("Selected SKUs"):
-                try:
-                    stores.append(int(line.strip()))
-                except ValueError:
-                    pass
-            if "Selected SKUs" in line:
-                break
+        stores = load_mvp_stores(mvp_file)
         
         if stores:
             logger.info(f"Filtering to {len(stores)} MVP stores")
@@ -79,8 +76,10 @@ def load_mvp_data():
         logger.warning(f"MVP file not found at {mvp_file}, using all data")
     
     # Convert date column
-    if df[date_col].dtype == 'object':
-        df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_dates(df[date_col])
+    
+    if stores:
+        save_mvp_data_cache(df, mvp_file)
     
     logger.info(f"Loaded data: {len(df)} records, {df[store_col].nunique()} stores, {df[sku_col].nunique()} SKUs")
     
@@ -106,8 +105,12 @@ def prepare_daily_series(df, store_col, sku_col, date_col, sales_col):
         sales_col: 'demand'
     })
     
-    # Sort by date
-    df_daily = df_daily.sort_values(['date', store_col, sku_col])
+    # Categorical store/SKU keys let the groupbys below work on integer codes
+    df_daily[store_col] = df_daily[store_col].astype('category')
+    df_daily[sku_col] = df_daily[sku_col].astype('category')
+    
+    # Sort each store-SKU series by date once; the splits below keep this order
+    df_daily = df_daily.sort_values([store_col, sku_col, 'date'])
     
     logger.info(f"Daily aggregation complete: {len(df_daily)} records")
     logger.info(f"Date range: {df_daily['date'].min()} to {df_daily['date'].max()}")
@@ -123,8 +126,8 @@ def split_train_test(df_daily, test_days=14):
     max_date = df_daily['date'].max()
     split_date = max_date - timedelta(days=test_days)
     
-    train = df_daily[df_daily['date'] <= split_date].copy()
-    test = df_daily[df_daily['date'] > split_date].copy()
+    train = df_daily[df_daily['date'] <= split_date]
+    test = df_daily[df_daily['date'] > split_date]
     
     logger.info(f"Train: {len(train)} records ({train['date'].min()} to {train['date'].max()})")
     logger.info(f"Test: {len(test)} records ({test['date'].min()} to {test['date'].max()})")
@@ -132,82 +135,105 @@ def split_train_test(df_daily, test_days=14):
     return train, test, split_date
 
 
+def baseline_forecasts(train, test, store_col, sku_col, min_history=7):
+    """Compute all baseline forecasts for every store-SKU in one pass.
+    
+    Equivalent to training LastValue, MovingAverage (7 and 14) and
+    SeasonalNaive (7) forecasters on each store-SKU's training series and
+    predicting its test horizon, using grouped tail/shift operations
+    instead of a per-series Python loop.
+    
+    Args:
+        train: Daily training data, sorted by store, SKU and date
+        test: Daily test data, sorted by store, SKU and date
+        store_col: Store column name
+        sku_col: SKU column name
+        min_history: Minimum training days for a store-SKU to be forecast
+        
+    Returns:
+        Test rows (sorted by store, SKU and date) with an 'actual' column
+        and one prediction column per model
+    """
+    keys = [store_col, sku_col]
+    
+    # Only forecast store-SKUs with enough history
+    history_len = train.groupby(keys, observed=True).size()
+    eligible = history_len[history_len >= min_history].index
+    test = test[pd.MultiIndex.from_frame(test[keys]).isin(eligible)]
+    
+    forecasts = test[keys + ['date', 'demand']].rename(columns={'demand': 'actual'})
+    forecasts = forecasts.reset_index(drop=True)
+    test_keys = pd.MultiIndex.from_frame(forecasts[keys])
+    
+    def last_values(n):
+        return train.groupby(keys, observed=True).tail(n)
+    
+    # Last observed value and moving averages broadcast over the horizon
+    forecasts['LastValue'] = last_values(1).set_index(keys)['demand'].reindex(test_keys).to_numpy()
+    for window in (7, 14):
+        window_mean = last_values(window).groupby(keys, observed=True)['demand'].mean()
+        forecasts[f'MovingAverage_{window}'] = window_mean.reindex(test_keys).to_numpy()
+    
+    # Seasonal naive cycles through the last season of training values
+    season_length = 7
+    last_season = last_values(season_length)
+    season_index = pd.MultiIndex.from_arrays([
+        last_season[store_col],
+        last_season[sku_col],
+        last_season.groupby(keys, observed=True).cumcount()
+    ])
+    step = forecasts.groupby(keys, observed=True).cumcount() % season_length
+    forecast_index = pd.MultiIndex.from_arrays([forecasts[store_col], forecasts[sku_col], step])
+    forecasts[f'SeasonalNaive_{season_length}'] = pd.Series(
+        last_season['demand'].to_numpy(), index=season_index
+    ).reindex(forecast_index).to_numpy()
+    
+    return forecasts
+
+
 def train_and_evaluate_baselines(train, test, store_col, sku_col):
     """Train and evaluate all baseline models."""
     logger.info("Training and evaluating baseline models")
     
     results = {}
     
-    # Group by store-SKU for evaluation
-    test_grouped = test.groupby([store_col, sku_col])
-    train_grouped = train.groupby([store_col, sku_col])
-    
-    # Get unique store-SKU combinations
-    store_skus = list(test_grouped.groups.keys())
-    logger.info(f"Evaluating on {len(store_skus)} store-SKU combinations")
+    forecasts = baseline_forecasts(train, test, store_col, sku_col)
+    num_series = len(forecasts[[store_col, sku_col]].drop_duplicates())
+    logger.info(f"Evaluating on {num_series} store-SKU combinations")
     
-    # Models to evaluate
-    models = {
-        'LastValue': LastValueForecaster(),
-        'MovingAverage_7': MovingAverageForecaster(window=7),
-        'MovingAverage_14': MovingAverageForecaster(window=14),
-        'SeasonalNaive_7': SeasonalNaiveForecaster(season_length=7),
-    }
+    model_names = ['LastValue', 'MovingAverage_7', 'MovingAverage_14', 'SeasonalNaive_7']
     
-    all_predictions = []
+    # Only the rows needed for the saved sample are materialized per model;
+    # metrics are computed on the forecast columns directly
+    sample_predictions = []
+    sample_rows = 0
     
-    for model_name, model in models.items():
-        logger.info(f"Training {model_name}...")
+    for model_name in model_names:
+        if forecasts.empty:
+            continue
         
-        predictions_list = []
+        if sample_rows < PREDICTIONS_SAMPLE_ROWS:
+            sample = forecasts.head(PREDICTIONS_SAMPLE_ROWS - sample_rows)
+            # Baselines have no uncertainty, so the bounds equal the forecast
+            sample_predictions.append(pd.DataFrame({
+                'predicted_demand': sample[model_name],
+                'lower_bound': sample[model_name],
+                'upper_bound': sample[model_name],
+                store_col: sample[store_col],
+                sku_col: sample[sku_col],
+                'actual': sample['actual'],
+                'model': model_name,
+            }))
+            sample_rows += len(sample)
         
-        # Train and predict for each store-SKU
-        for (store_id, sku_id) in store_skus[:100]:  # Limit to first 100 for speed
-            try:
-                # Get training data for this store-SKU
-                train_series = train_grouped.get_group((store_id, sku_id)).sort_values('date')
-                test_series = test_grouped.get_group((store_id, sku_id)).sort_values('date')
-                
-                if len(train_series) < 7:  # Need minimum data
-                    continue
-                
-                # Prepare data
-                train_data = pd.DataFrame({
-                    'date': train_series['date'],
-                    'demand': train_series['demand']
-                })
-                
-                # Train model
-                model.train(train_data, target_col='demand')
-                
-                # Predict
-                horizon = len(test_series)
-                preds = model.predict(train_data, horizon=horizon)
-                
-                # Add metadata
-                preds[store_col] = store_id
-                preds[sku_col] = sku_id
-                preds['actual'] = test_series['demand'].values
-                preds['model'] = model_name
-                
-                predictions_list.append(preds)
-                
-            except Exception as e:
-                logger.warning(f"Error for {store_id}-{sku_id}: {e}")
-                continue
+        # Evaluate
+        actual = forecasts['actual'].to_numpy()
+        predicted = forecasts[model_name].to_numpy()
         
-        if predictions_list:
-            all_predictions.extend(predictions_list)
-            
-            # Evaluate
-            combined_preds = pd.concat(predictions_list, ignore_index=True)
-            actual = pd.Series(combined_preds['actual'].values)
-            predicted = pd.Series(combined_preds['predicted_demand'].values)
-            
-            metrics = ForecastEvaluator.evaluate(actual, predicted)
-            
-            results[model_name] = metrics
-            logger.info(f"{model_name} - MAE: {metrics['mae']:.3f}, RMSE: {metrics['rmse']:.3f}, MAPE: {metrics['mape']:.2f}%")
+        metrics = ForecastEvaluator.evaluate(actual, predicted)
+        
+        results[model_name] = metrics
+        logger.info(f"{model_name} - MAE: {metrics['mae']:.3f}, RMSE: {metrics['rmse']:.3f}, MAPE: {metrics['mape']:.2f}%")
     
     # Create comparison table
     comparison = pd.DataFrame(results).T
@@ -216,7 +242,7 @@ def train_and_evaluate_baselines(train, test, store_col, sku_col):
     logger.info("\nModel Comparison (sorted by MAE):")
     logger.info(comparison.to_string())
     
-    return results, comparison, all_predictions
+    return results, comparison, sample_predictions
 
 
 def save_results(results, comparison, predictions, output_dir):
@@ -231,22 +257,17 @@ def save_results(results, comparison, predictions, output_dir):
     
     # Save detailed results
     results_path = output_dir / "baseline_model_results.json"
-    import json
-    # Convert numpy types to native Python types for JSON
-    results_json = {}
-    for model, metrics in results.items():
-        results_json[model] = {k: float(v) if isinstance(v, (np.integer, np.floating)) else v 
-                               for k, v in metrics.items()}
-    
-    with open(results_path, 'w') as f:
-        json.dump(results_json, f, indent=2)
+    # orjson serializes the numpy metric values directly
+    results_path.write_bytes(
+        orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    )
     logger.info(f"Saved results to {results_path}")
     
     # Save predictions sample
     if predictions:
         preds_df = pd.concat(predictions, ignore_index=True)
         preds_path = output_dir / "baseline_predictions_sample.csv"
-        preds_df.head(1000).to_csv(preds_path, index=False)
+        preds_df.head(PREDICTIONS_SAMPLE_ROWS).to_csv(preds_path, index=False)
         logger.info(f"Saved predictions sample to {preds_path}")
 
 
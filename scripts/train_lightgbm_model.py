@@ -13,13 +13,15 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import orjson
 import pandas as pd
-import numpy as np
 from datetime import timedelta
 
 from shared.config import get_config
 from shared.logging_setup import setup_logging, get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
+from shared.mvp_loader import load_cached_mvp_data, load_mvp_stores, save_mvp_data_cache
+from shared.utils import parse_dates
 from services.ingestion.datasets import load_freshretailnet_dataset
 from services.forecasting.features.aggregate_daily import aggregate_to_daily
 from services.forecasting.features.feature_engineering import (
@@ -27,7 +29,6 @@ from services.forecasting.features.feature_engineering import (
     get_feature_columns
 )
 from services.forecasting.models.lightgbm_model import LightGBMForecaster
-from services.forecasting.models.baseline import MovingAverageForecaster
 from services.forecasting.evaluators import ForecastEvaluator
 
 # Setup
@@ -40,41 +41,32 @@ def load_mvp_data():
     """Load and filter MVP subset data."""
     logger.info("Loading MVP subset data")
     
-    dataset = load_freshretailnet_dataset()
-    df = dataset['train'].to_pandas()
-    
     # Get column mappings
     store_col = COLUMN_MAPPINGS.get('store_id', 'store_id')
     sku_col = COLUMN_MAPPINGS.get('sku_id', 'product_id')
     date_col = COLUMN_MAPPINGS.get('date_col', 'dt')
     sales_col = COLUMN_MAPPINGS.get('sales_col', 'sale_amount')
     
+    # Reuse the subset cached by a previous run if the selection is unchanged
+    df = load_cached_mvp_data()
+    if df is not None:
+        logger.info(f"Loaded cached MVP data: {len(df)} records")
+        return df, store_col, sku_col, date_col, sales_col
+    
+    dataset = load_freshretailnet_dataset()
+    df = dataset['train'].to_pandas()
+    
     # Load MVP store list
-    mvp_file = Path(config.data.processed_path) / "mvp_selection" / "mvp_subset.txt"
-    if mvp_file.exists():
-        with open(mvp_file, 'r') as f:
-            lines = f.readlines()
-        stores = []
-        in_stores_section = False
-        for line in lines:
-            if "Selected Stores" in line:
-                in_stores_section = True
-                continue
-            if in_stores_section and line.strip() and not line.strip().startswith("Selected SKUs"):
-                try:
-                    stores.append(int(line.strip()))
-                except ValueError:
-                    pass
-            if "Selected SKUs" in line:
-                break
-        
-        if stores:
-            logger.info(f"Filtering to {len(stores)} MVP stores")
-            df = df[df[store_col].isin(stores)].copy()
+    stores = load_mvp_stores()
+    if stores:
+        logger.info(f"Filtering to {len(stores)} MVP stores")
+        df = df[df[store_col].isin(stores)].copy()
     
     # Convert date column
-    if df[date_col].dtype == 'object':
-        df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_dates(df[date_col])
+    
+    if stores:
+        save_mvp_data_cache(df)
     
     logger.info(f"Loaded data: {len(df)} records")
     
@@ -98,7 +90,12 @@ def prepare_daily_series(df, store_col, sku_col, date_col, sales_col):
         sales_col: 'demand'
     })
     
-    df_daily = df_daily.sort_values(['date', store_col, sku_col])
+    # Categorical store/SKU keys let the groupbys below work on integer codes
+    df_daily[store_col] = df_daily[store_col].astype('category')
+    df_daily[sku_col] = df_daily[sku_col].astype('category')
+    
+    # Sort each store-SKU series by date once; the splits below keep this order
+    df_daily = df_daily.sort_values([store_col, sku_col, 'date'])
     
     logger.info(f"Daily aggregation: {len(df_daily)} records")
     
@@ -113,9 +110,9 @@ def split_train_test(df_daily, test_days=14, val_days=7):
     test_start = max_date - timedelta(days=test_days)
     val_start = test_start - timedelta(days=val_days)
     
-    train = df_daily[df_daily['date'] <= val_start].copy()
-    val = df_daily[(df_daily['date'] > val_start) & (df_daily['date'] <= test_start)].copy()
-    test = df_daily[df_daily['date'] > test_start].copy()
+    train = df_daily[df_daily['date'] <= val_start]
+    val = df_daily[(df_daily['date'] > val_start) & (df_daily['date'] <= test_start)]
+    test = df_daily[df_daily['date'] > test_start]
     
     logger.info(f"Train: {len(train)} records ({train['date'].min()} to {train['date'].max()})")
     logger.info(f"Val: {len(val)} records ({val['date'].min()} to {val['date'].max()})")
@@ -128,51 +125,41 @@ def train_and_evaluate_lightgbm(train, val, test, store_col, sku_col):
     """Train LightGBM model and evaluate."""
     logger.info("Training LightGBM model")
     
-    # Create features for training data
-    logger.info("Creating features for training data")
-    train_features = create_forecast_features(
-        train,
+    # Create features once over the full history, so lag and rolling
+    # features at the start of validation and test see the preceding days
+    logger.info("Creating features for train, validation and test data")
+    all_features = create_forecast_features(
+        pd.concat([train, val, test], ignore_index=True),
         date_col='date',
         target_col='demand',
         store_col=store_col,
         sku_col=sku_col
     )
     
-    # Create features for validation data
-    logger.info("Creating features for validation data")
-    val_features = create_forecast_features(
-        val,
-        date_col='date',
-        target_col='demand',
-        store_col=store_col,
-        sku_col=sku_col
-    )
-    
-    # Create features for test data
-    logger.info("Creating features for test data")
-    test_features = create_forecast_features(
-        test,
-        date_col='date',
-        target_col='demand',
-        store_col=store_col,
-        sku_col=sku_col
-    )
+    # Split back into the original date ranges
+    train_end = train['date'].max()
+    val_end = val['date'].max()
+    in_train = all_features['date'] <= train_end
+    in_val = (all_features['date'] > train_end) & (all_features['date'] <= val_end)
+    in_test = all_features['date'] > val_end
     
     # Get feature columns (exclude metadata)
     exclude_cols = ['date', store_col, sku_col, 'demand']
-    feature_cols = get_feature_columns(train_features, exclude_cols=exclude_cols)
+    feature_cols = get_feature_columns(all_features, exclude_cols=exclude_cols)
     
     logger.info(f"Using {len(feature_cols)} features")
     
-    # Sample data for faster training (use subset of store-SKU combinations)
-    train_grouped = train_features.groupby([store_col, sku_col])
-    store_skus = list(train_grouped.groups.keys())[:200]  # Limit to 200 for speed
+    # Sample data for faster training (use subset of store-SKU combinations),
+    # numbering the series once for all three splits
+    series_id = all_features.groupby([store_col, sku_col], observed=True).ngroup()
+    in_sample = series_id < 200  # Limit to 200 for speed
+    num_series = int(series_id[in_sample].nunique())
     
-    train_sample = train_features[train_features.groupby([store_col, sku_col]).ngroup().isin(range(len(store_skus)))].copy()
-    val_sample = val_features[val_features.groupby([store_col, sku_col]).ngroup().isin(range(len(store_skus)))].copy()
-    test_sample = test_features[test_features.groupby([store_col, sku_col]).ngroup().isin(range(len(store_skus)))].copy()
+    train_sample = all_features[in_train & in_sample]
+    val_sample = all_features[in_val & in_sample]
+    test_sample = all_features[in_test & in_sample]
     
-    logger.info(f"Training on {len(train_sample)} records, {len(store_skus)} store-SKU combinations")
+    logger.info(f"Training on {len(train_sample)} records, {num_series} store-SKU combinations")
     
     # Train model
     model = LightGBMForecaster(
@@ -190,89 +177,49 @@ def train_and_evaluate_lightgbm(train, val, test, store_col, sku_col):
     
     # Evaluate on test set
     logger.info("Evaluating on test set")
-    test_sample_sorted = test_sample.sort_values([store_col, sku_col, 'date'])
-    
-    predictions_list = []
-    test_grouped = test_sample_sorted.groupby([store_col, sku_col])
-    
-    for (store_id, sku_id), group_df in list(test_grouped)[:100]:  # Limit to 100 for speed
-        try:
-            # Get corresponding training data for this store-SKU
-            train_group = train_sample[train_sample[store_col] == store_id]
-            train_group = train_group[train_group[sku_col] == sku_id].sort_values('date')
-            
-            if len(train_group) < 7:
-                continue
-            
-            # Prepare features for prediction
-            pred_data = group_df.copy()
-            
-            # Predict
-            preds = model.predict(pred_data, horizon=len(group_df), feature_cols=feature_cols)
-            
-            # Add metadata
-            preds[store_col] = store_id
-            preds[sku_col] = sku_id
-            preds['actual'] = group_df['demand'].values
-            preds['date'] = group_df['date'].values
-            
-            predictions_list.append(preds)
-        except Exception as e:
-            logger.warning(f"Error for {store_id}-{sku_id}: {e}")
-            continue
-    
-    if predictions_list:
-        combined_preds = pd.concat(predictions_list, ignore_index=True)
-        actual = pd.Series(combined_preds['actual'].values)
-        predicted = pd.Series(combined_preds['predicted_demand'].values)
+    keys = [store_col, sku_col]
+    
+    # Evaluate every sampled store-SKU with at least a week of training data;
+    # the feature frame is already sorted by store, SKU and date
+    history_len = train_sample.groupby(keys, observed=True).size()
+    evaluated = history_len[history_len >= 7].index
+    test_eval = test_sample[pd.MultiIndex.from_frame(test_sample[keys]).isin(evaluated)]
+    
+    if not test_eval.empty:
+        # Predict all evaluated rows in one batch
+        combined_preds = model.predict(test_eval, horizon=len(test_eval), feature_cols=feature_cols)
+        
+        # Add metadata
+        combined_preds[store_col] = test_eval[store_col].to_numpy()
+        combined_preds[sku_col] = test_eval[sku_col].to_numpy()
+        combined_preds['actual'] = test_eval['demand'].to_numpy()
+        combined_preds['date'] = test_eval['date'].to_numpy()
+        
+        actual = combined_preds['actual'].to_numpy()
+        predicted = combined_preds['predicted_demand'].to_numpy()
         
         metrics = ForecastEvaluator.evaluate(actual, predicted)
         
         logger.info(f"LightGBM - MAE: {metrics['mae']:.3f}, RMSE: {metrics['rmse']:.3f}, MAPE: {metrics['mape']:.2f}%")
         
-        # Compare with baseline
-        baseline_model = MovingAverageForecaster(window=7)
-        baseline_train = train_sample.sort_values([store_col, sku_col, 'date'])
-        baseline_predictions = []
+        # Compare with baseline: each series' mean demand over its last
+        # 7 training days, held flat over the test horizon
+        last_week = train_sample.groupby(keys, observed=True).tail(7)
+        moving_average = last_week.groupby(keys, observed=True)['demand'].mean()
+        baseline_predicted = moving_average.reindex(
+            pd.MultiIndex.from_frame(test_eval[keys])
+        ).to_numpy()
+        
+        baseline_metrics = ForecastEvaluator.evaluate(actual, baseline_predicted)
+        
+        logger.info(f"Baseline (MA_7) - MAE: {baseline_metrics['mae']:.3f}, RMSE: {baseline_metrics['rmse']:.3f}, MAPE: {baseline_metrics['mape']:.2f}%")
         
-        for (store_id, sku_id), group_df in list(test_grouped)[:100]:
-            try:
-                train_group = baseline_train[baseline_train[store_col] == store_id]
-                train_group = train_group[train_group[sku_col] == sku_id].sort_values('date')
-                
-                if len(train_group) < 7:
-                    continue
-                
-                baseline_model.train(
-                    pd.DataFrame({'date': train_group['date'], 'demand': train_group['demand']}),
-                    target_col='demand'
-                )
-                
-                preds = baseline_model.predict(
-                    pd.DataFrame({'date': train_group['date'], 'demand': train_group['demand']}),
-                    horizon=len(group_df)
-                )
-                
-                baseline_predictions.append({
-                    'actual': group_df['demand'].values,
-                    'predicted': preds['predicted_demand'].values
-                })
-            except Exception:
-                continue
+        improvement = {
+            'mae': (baseline_metrics['mae'] - metrics['mae']) / baseline_metrics['mae'] * 100,
+            'mape': (baseline_metrics['mape'] - metrics['mape']) / baseline_metrics['mape'] * 100
+        }
         
-        if baseline_predictions:
-            baseline_actual = pd.Series(np.concatenate([p['actual'] for p in baseline_predictions]))
-            baseline_predicted = pd.Series(np.concatenate([p['predicted'] for p in baseline_predictions]))
-            baseline_metrics = ForecastEvaluator.evaluate(baseline_actual, baseline_predicted)
-            
-            logger.info(f"Baseline (MA_7) - MAE: {baseline_metrics['mae']:.3f}, RMSE: {baseline_metrics['rmse']:.3f}, MAPE: {baseline_metrics['mape']:.2f}%")
-            
-            improvement = {
-                'mae': (baseline_metrics['mae'] - metrics['mae']) / baseline_metrics['mae'] * 100,
-                'mape': (baseline_metrics['mape'] - metrics['mape']) / baseline_metrics['mape'] * 100
-            }
-            
-            logger.info(f"Improvement: MAE {improvement['mae']:.1f}%, MAPE {improvement['mape']:.1f}%")
+        logger.info(f"Improvement: MAE {improvement['mae']:.1f}%, MAPE {improvement['mape']:.1f}%")
         
         return metrics, combined_preds, model
     
@@ -286,12 +233,11 @@ def save_results(metrics, predictions, model, output_dir):
     
     # Save metrics
     if metrics:
-        import json
         metrics_path = output_dir / "lightgbm_results.json"
-        metrics_json = {k: float(v) if isinstance(v, (np.integer, np.floating)) else v 
-                       for k, v in metrics.items()}
-        with open(metrics_path, 'w') as f:
-            json.dump(metrics_json, f, indent=2)
+        # orjson serializes the numpy metric values directly
+        metrics_path.write_bytes(
+            orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
         logger.info(f"Saved metrics to {metrics_path}")
     
     # Save predictions
@@ -9,7 +9,9 @@ Provides endpoints for:
 - Upcoming holidays
 """
 
+import heapq
 from datetime import date, timedelta
+from operator import itemgetter
 from typing import Optional, List, Dict
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -20,15 +22,41 @@ from services.api_gateway.models import User, Product, InventorySnapshot, Foreca
 from services.api_gateway.auth import get_current_user
 from services.api_gateway.demand_factors_service import get_demand_factors_service
 from services.api_gateway.sales_data_service import SalesDataService
-from services.api_gateway.price_service import get_product_price
+from services.api_gateway.price_service import get_product_prices
 from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
+
+# Handlers are plain functions because they use the sync database session and
+# blocking API clients; FastAPI runs them in its threadpool, off the event loop
 router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
 
 
+def _latest_store_inventory(db: Session, store_id: str) -> List[tuple]:
+    """
+    Get each product's latest inventory quantity for a store in one query.
+    
+    Returns:
+        (Product, quantity) pairs for products with an inventory snapshot
+    """
+    latest = db.query(
+        InventorySnapshot.product_id,
+        InventorySnapshot.quantity,
+        func.row_number().over(
+            partition_by=InventorySnapshot.product_id,
+            order_by=InventorySnapshot.snapshot_date.desc()
+        ).label('rn')
+    ).filter(
+        InventorySnapshot.store_id == int(store_id)
+    ).subquery()
+    
+    return db.query(Product, latest.c.quantity).join(
+        latest, latest.c.product_id == Product.id
+    ).filter(latest.c.rn == 1).order_by(Product.id).all()
+
+
 @router.get("/stores/{store_id}/weather-forecast")
-async def get_weather_forecast(
+def get_weather_forecast(
     store_id: str,
     days_ahead: int = 7,
     current_user: User = Depends(get_current_user),
@@ -57,7 +85,7 @@ async def get_weather_forecast(
 
 
 @router.get("/stores/{store_id}/upcoming-holidays")
-async def get_upcoming_holidays(
+def get_upcoming_holidays(
     store_id: str,
     days_ahead: int = 30,
     current_user: User = Depends(get_current_user),
@@ -86,7 +114,7 @@ async def get_upcoming_holidays(
 
 
 @router.get("/stores/{store_id}/demand-factors")
-async def get_demand_factors(
+def get_demand_factors(
     store_id: str,
     days_ahead: int = 7,
     current_user: User = Depends(get_current_user),
@@ -109,7 +137,7 @@ async def get_demand_factors(
 
 
 @router.get("/stores/{store_id}/category-analysis")
-async def get_category_analysis(
+def get_category_analysis(
     store_id: str,
     period_days: int = 30,
     current_user: User = Depends(get_current_user),
@@ -119,41 +147,31 @@ async def get_category_analysis(
     Get sales analysis by product category.
     """
     try:
-        # Get products with categories
-        products = db.query(Product).all()
+        # Latest inventory and price of every stocked product, fetched in bulk
+        inventory = _latest_store_inventory(db, store_id)
+        prices = get_product_prices(db, [product for product, _ in inventory])
         
-        # Group by category
+        # Group by category, listing categories without stocked products too
         category_stats = {}
-        sales_service = SalesDataService()
+        for category_name, category_id in db.query(Product.category, Product.category_id).distinct():
+            category = category_name or (f"Category {category_id}" if category_id else "Uncategorized")
+            category_stats[category] = {
+                "name": category,
+                "product_count": 0,
+                "total_quantity": 0,
+                "total_revenue": 0.0
+            }
         
-        for product in products:
+        for product, quantity in inventory:
             # Use human-readable category name, fallback to category_id
             category = product.category or (f"Category {product.category_id}" if product.category_id else "Uncategorized")
             
-            if category not in category_stats:
-                category_stats[category] = {
-                    "name": category,
-                    "product_count": 0,
-                    "total_quantity": 0,
-                    "total_revenue": 0.0
-                }
-            
-            # Get inventory for quantity estimation
-            inv = db.query(InventorySnapshot).filter(
-                InventorySnapshot.product_id == product.id,
-                InventorySnapshot.store_id == int(store_id)
-            ).order_by(InventorySnapshot.snapshot_date.desc()).first()
+            category_stats[category]["product_count"] += 1
+            category_stats[category]["total_quantity"] += quantity
             
-            if inv:
-                category_stats[category]["product_count"] += 1
-                category_stats[category]["total_quantity"] += inv.quantity
-                
-                # Get price and estimate revenue
-                price = get_product_price(db, product_id=product.id)
-                if price:
-                    # Estimate daily sales as ~20% of inventory
-                    estimated_daily_sales = inv.quantity * 0.20
-                    category_stats[category]["total_revenue"] += estimated_daily_sales * price * period_days
+            # Estimate daily sales as ~20% of inventory
+            estimated_daily_sales = quantity * 0.20
+            category_stats[category]["total_revenue"] += estimated_daily_sales * prices[product.id] * period_days
         
         # Convert to list and calculate percentages
         categories = list(category_stats.values())
@@ -181,7 +199,7 @@ async def get_category_analysis(
 
 
 @router.get("/stores/{store_id}/top-products")
-async def get_top_products_analysis(
+def get_top_products_analysis(
     store_id: str,
     limit: int = 5,
     sort_by: str = "revenue",
@@ -193,46 +211,41 @@ async def get_top_products_analysis(
     Get top performing products (best sellers).
     """
     try:
-        products = db.query(Product).all()
+        # Latest inventory and price of every stocked product, fetched in bulk
+        inventory = _latest_store_inventory(db, store_id)
+        prices = get_product_prices(db, [product for product, _ in inventory])
         product_stats = []
         
-        for product in products:
-            # Get inventory
-            inv = db.query(InventorySnapshot).filter(
-                InventorySnapshot.product_id == product.id,
-                InventorySnapshot.store_id == int(store_id)
-            ).order_by(InventorySnapshot.snapshot_date.desc()).first()
+        for product, quantity in inventory:
+            price = prices[product.id] or 2.99
+            # Estimate sales based on inventory turnover
+            estimated_sales = quantity * 0.25  # 25% daily turnover
+            estimated_revenue = estimated_sales * price * period_days
             
-            if inv:
-                price = get_product_price(db, product_id=product.id) or 2.99
-                # Estimate sales based on inventory turnover
-                estimated_sales = inv.quantity * 0.25  # 25% daily turnover
-                estimated_revenue = estimated_sales * price * period_days
-                
-                # Calculate trend (simplified - would use historical data in production)
-                trend = ((hash(product.sku_id) % 30) - 15)  # Simulated -15% to +15%
-                
-                product_stats.append({
-                    "sku_id": product.sku_id,
-                    "name": product.name or f"Product {product.sku_id}",
-                    "category": product.category or (f"Category {product.category_id}" if product.category_id else "Uncategorized"),
-                    "sales": round(estimated_sales * period_days),
-                    "revenue": round(estimated_revenue, 2),
-                    "change_percent": trend,
-                    "price": round(price, 2)
-                })
+            # Calculate trend (simplified - would use historical data in production)
+            trend = ((hash(product.sku_id) % 30) - 15)  # Simulated -15% to +15%
+            
+            product_stats.append({
+                "sku_id": product.sku_id,
+                "name": product.name or f"Product {product.sku_id}",
+                "category": product.category or (f"Category {product.category_id}" if product.category_id else "Uncategorized"),
+                "sales": round(estimated_sales * period_days),
+                "revenue": round(estimated_revenue, 2),
+                "change_percent": trend,
+                "price": round(price, 2)
+            })
         
-        # Sort based on criteria
-        if sort_by == "sales":
-            product_stats.sort(key=lambda x: x["sales"], reverse=True)
-        else:
-            product_stats.sort(key=lambda x: x["revenue"], reverse=True)
+        # Only the top and bottom products are needed, so select them with
+        # heaps instead of sorting every product
+        sort_key = "sales" if sort_by == "sales" else "revenue"
+        best_sellers = heapq.nlargest(limit, product_stats, key=itemgetter(sort_key))
+        worst_sellers = heapq.nsmallest(limit, product_stats, key=itemgetter(sort_by))
         
         return {
             "store_id": store_id,
             "period_days": period_days,
-            "best_sellers": product_stats[:limit],
-            "worst_sellers": sorted(product_stats, key=lambda x: x[sort_by])[:limit]
+            "best_sellers": best_sellers,
+            "worst_sellers": worst_sellers
         }
     except Exception as e:
         logger.error(f"Error in top products analysis: {e}", exc_info=True)
@@ -243,7 +256,7 @@ async def get_top_products_analysis(
 
 
 @router.get("/stores/{store_id}/forecast-chart")
-async def get_forecast_chart_data(
+def get_forecast_chart_data(
     store_id: str,
     days_ahead: int = 7,
     current_user: User = Depends(get_current_user),
@@ -256,14 +269,14 @@ async def get_forecast_chart_data(
         factors_service = get_demand_factors_service()
         today = date.today()
         
+        # Get demand factors for the whole period at once
+        factors_range = factors_service.get_factors_range(store_id, today, days_ahead)
+        
         chart_data = []
         
-        for i in range(days_ahead):
+        for i, factors in enumerate(factors_range):
             target_date = today + timedelta(days=i)
             
-            # Get demand factors
-            factors = factors_service.get_all_factors(store_id, target_date)
-            
             # Base forecast (would come from actual forecast model in production)
             base_forecast = 1200 + (hash(str(target_date)) % 400)  # Simulated base
             
@@ -308,7 +321,7 @@ async def get_forecast_chart_data(
 
 
 @router.get("/stores/{store_id}/sales-forecast-comparison")
-async def get_sales_vs_forecast(
+def get_sales_vs_forecast(
     store_id: str,
     period_days: int = 7,
     current_user: User = Depends(get_current_user),
@@ -321,11 +334,15 @@ async def get_sales_vs_forecast(
         sales_service = SalesDataService()
         factors_service = get_demand_factors_service()
         today = date.today()
+        start_date = today - timedelta(days=period_days - 1)
+        
+        # Get demand factors for the whole period at once
+        factors_range = factors_service.get_factors_range(store_id, start_date, period_days)
         
         comparison_data = []
         
-        for i in range(period_days):
-            target_date = today - timedelta(days=period_days - 1 - i)
+        for i, factors in enumerate(factors_range):
+            target_date = start_date + timedelta(days=i)
             
             # Get actual sales from dataset
             daily_sales = sales_service.get_store_daily_sales(
@@ -334,7 +351,6 @@ async def get_sales_vs_forecast(
             )
             
             # Get what the forecast would have been
-            factors = factors_service.get_all_factors(store_id, target_date)
             base_forecast = 1200 + (hash(str(target_date)) % 400)
             forecast = round(base_forecast * factors["seasonality_factor"])
             
@@ -9,8 +9,9 @@ This ensures all services use the same real-time data from:
 - Nager.Date API (holidays)
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Tuple
 
 from services.api_gateway.weather_service import get_weather_service, WeatherService
 from services.api_gateway.holiday_service import get_holiday_service, HolidayService
@@ -29,6 +30,13 @@ DAY_OF_WEEK_FACTORS = {
     6: {"name": "Sunday", "factor": 1.10, "description": "Sunday - moderate traffic"},
 }
 
+# How long cached endpoint responses stay fresh; weather forecasts are cached
+# by WeatherService itself
+RESPONSE_CACHE_DURATIONS = {
+    "upcoming_holidays": timedelta(hours=24),
+    "demand_summary": timedelta(minutes=15),
+}
+
 
 class DemandFactorsService:
     """
@@ -46,6 +54,43 @@ class DemandFactorsService:
         self.logger = get_logger(__name__)
         self.weather_service = get_weather_service()
         self.holiday_service = get_holiday_service()
+        self._response_cache: Dict[Tuple, Any] = {}
+        self._response_cache_expiry: Dict[Tuple, datetime] = {}
+    
+    def _get_cached_response(
+        self,
+        endpoint: str,
+        store_id: str,
+        days_ahead: int,
+        fetch: Callable[[], Any],
+        is_fallback: Callable[[Any], bool]
+    ) -> Any:
+        """
+        Get an endpoint response from the cache, refreshing it once expired.
+        
+        The underlying services answer with estimated fallback data when
+        their APIs are unavailable. Such responses are never cached: the last
+        cached response is served instead if there is one, and the APIs are
+        tried again on the next request.
+        """
+        cache_key = (endpoint, store_id, days_ahead)
+        expiry = self._response_cache_expiry.get(cache_key)
+        if expiry is not None and datetime.now() < expiry:
+            return self._response_cache[cache_key]
+        
+        response = fetch()
+        if is_fallback(response):
+            if cache_key in self._response_cache:
+                self.logger.warning(f"Serving stale {endpoint} for store {store_id}")
+                return self._response_cache[cache_key]
+            return response
+        
+        # Responses are relative to today, so never keep one past midnight
+        expiry = datetime.now() + RESPONSE_CACHE_DURATIONS[endpoint]
+        midnight = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+        self._response_cache[cache_key] = response
+        self._response_cache_expiry[cache_key] = min(expiry, midnight)
+        return response
     
     def get_all_factors(
         self,
@@ -62,18 +107,30 @@ class DemandFactorsService:
         Returns:
             Dict containing all factors and combined multiplier
         """
+        # Get weather factor (real-time from Open-Meteo)
+        weather_data = self.weather_service.get_weather_factor_for_date(store_id, target_date)
+        
+        # Get holiday factor (real-time from Nager.Date)
+        holiday_data = self.holiday_service.get_holiday_factor_for_date(store_id, target_date)
+        
+        return self._combine_factors(store_id, target_date, weather_data, holiday_data)
+    
+    def _combine_factors(
+        self,
+        store_id: str,
+        target_date: date,
+        weather_data: Dict[str, Any],
+        holiday_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine day-of-week, weather and holiday data into the factors dict."""
         # Get day of week factor
         day_of_week = target_date.weekday()
         day_info = DAY_OF_WEEK_FACTORS[day_of_week]
         day_factor = day_info["factor"]
         is_weekend = day_of_week >= 5
         
-        # Get weather factor (real-time from Open-Meteo)
-        weather_data = self.weather_service.get_weather_factor_for_date(store_id, target_date)
         weather_factor = weather_data.get("weather_factor", 1.0)
         
-        # Get holiday factor (real-time from Nager.Date)
-        holiday_data = self.holiday_service.get_holiday_factor_for_date(store_id, target_date)
         holiday_factor = holiday_data.get("factor", 1.0)
         is_holiday = holiday_data.get("is_holiday", False)
         is_pre_holiday = holiday_data.get("is_pre_holiday", False)
@@ -131,6 +188,7 @@ class DemandFactorsService:
             },
             
             # Metadata
+            "is_fallback": weather_data.get("is_fallback", False) or holiday_data.get("is_fallback", False),
             "generated_at": datetime.now().isoformat(),
             "data_sources": {
                 "weather": "Open-Meteo API (real-time)",
@@ -156,14 +214,27 @@ class DemandFactorsService:
         Returns:
             List of factor dictionaries for each day
         """
-        factors_list = []
+        if days <= 0:
+            return []
         
-        for i in range(days):
-            target_date = start_date + timedelta(days=i)
-            factors = self.get_all_factors(store_id, target_date)
-            factors_list.append(factors)
+        dates = [start_date + timedelta(days=i) for i in range(days)]
         
-        return factors_list
+        # Weather comes from one forecast covering the whole range and holidays
+        # from the yearly calendars; the two APIs are queried concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            weather_future = executor.submit(
+                self.weather_service.get_weather_factors_for_range, store_id, start_date, days
+            )
+            holidays_future = executor.submit(
+                lambda: [self.holiday_service.get_holiday_factor_for_date(store_id, d) for d in dates]
+            )
+            weather_list = weather_future.result()
+            holiday_list = holidays_future.result()
+        
+        return [
+            self._combine_factors(store_id, target_date, weather_data, holiday_data)
+            for target_date, weather_data, holiday_data in zip(dates, weather_list, holiday_list)
+        ]
     
     def get_weather_forecast(
         self,
@@ -171,11 +242,7 @@ class DemandFactorsService:
         days_ahead: int = 7
     ) -> Dict[str, Any]:
         """Get weather forecast for a store."""
-        return self.weather_service.get_weather_forecast(
-            store_id, 
-            date.today(), 
-            days_ahead
-        )
+        return self.weather_service.get_weather_forecast(store_id, date.today(), days_ahead)
     
     def get_upcoming_holidays(
         self,
@@ -183,7 +250,13 @@ class DemandFactorsService:
         days_ahead: int = 30
     ) -> List[Dict[str, Any]]:
         """Get upcoming holidays for a store."""
-        return self.holiday_service.get_upcoming_holidays(store_id, days_ahead)
+        today = date.today()
+        years = {today.year, (today + timedelta(days=days_ahead)).year}
+        return self._get_cached_response(
+            "upcoming_holidays", store_id, days_ahead,
+            lambda: self.holiday_service.get_upcoming_holidays(store_id, days_ahead),
+            lambda _: not all(self.holiday_service.has_calendar(store_id, year) for year in years)
+        )
     
     def get_demand_summary(
         self,
@@ -200,6 +273,14 @@ class DemandFactorsService:
         Returns:
             Summary with averages, highs, lows, and notable days
         """
+        return self._get_cached_response(
+            "demand_summary", store_id, days_ahead,
+            lambda: self._build_demand_summary(store_id, days_ahead),
+            lambda summary: any(f["is_fallback"] for f in summary.get("daily_factors", []))
+        )
+    
+    def _build_demand_summary(self, store_id: str, days_ahead: int) -> Dict[str, Any]:
+        """Build the demand factor summary for the upcoming period."""
         factors_list = self.get_factors_range(store_id, date.today(), days_ahead)
         
         if not factors_list:
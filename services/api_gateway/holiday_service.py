@@ -290,7 +290,15 @@ class HolidayService:
             Dict with holiday factor and details
         """
         country_code = self._get_store_country(store_id)
-        return self.is_holiday(target_date, country_code)
+        holiday = self.is_holiday(target_date, country_code)
+        # Flag results computed without the official calendar (API unavailable)
+        holiday["is_fallback"] = not self.has_calendar(store_id, target_date.year)
+        return holiday
+    
+    def has_calendar(self, store_id: str, year: int) -> bool:
+        """Check whether the official holiday calendar for a store's country and year is loaded."""
+        country_code = self._get_store_country(store_id)
+        return self._is_cache_valid(f"{country_code}_{year}")
     
     def get_upcoming_holidays(
         self,
@@ -2,9 +2,9 @@
 
 import hashlib
 from datetime import date
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_
 
 from services.api_gateway.models import ProductPrice, ProductCost, Product
 from shared.logging_setup import get_logger
@@ -113,6 +113,59 @@ def get_product_price(
     return _generate_fallback_price(str(product_id), None)
 
 
+def get_product_prices(
+    db: Session,
+    products: Iterable[Product],
+    target_date: Optional[date] = None
+) -> Dict[int, float]:
+    """
+    Get the current or historical prices for many products in one query.
+    
+    Args:
+        db: Database session
+        products: Products to price
+        target_date: Date to get prices for (defaults to today)
+        
+    Returns:
+        Mapping of product ID to price, using the same varied fallback
+        price as get_product_price for products without a price record
+    """
+    if target_date is None:
+        target_date = date.today()
+    
+    products = list(products)
+    if not products:
+        return {}
+    
+    # Latest price in effect on the target date for each product
+    ranked = db.query(
+        ProductPrice.product_id,
+        ProductPrice.price,
+        func.row_number().over(
+            partition_by=ProductPrice.product_id,
+            order_by=ProductPrice.effective_date.desc()
+        ).label('rn')
+    ).filter(
+        ProductPrice.product_id.in_([product.id for product in products]),
+        ProductPrice.effective_date <= target_date,
+        or_(
+            ProductPrice.end_date.is_(None),
+            ProductPrice.end_date >= target_date
+        )
+    ).subquery()
+    
+    prices = {
+        product_id: float(price)
+        for product_id, price in db.query(ranked.c.product_id, ranked.c.price).filter(ranked.c.rn == 1)
+    }
+    
+    return {
+        product.id: prices[product.id] if product.id in prices
+        else _generate_fallback_price(product.sku_id, product.category_id)
+        for product in products
+    }
+
+
 def get_product_cost(
     db: Session,
     product_id: Optional[int] = None,
@@ -15,6 +15,7 @@ from services.ingestion.datasets import load_freshretailnet_dataset
 from shared.column_mappings import COLUMN_MAPPINGS
 from shared.logging_setup import get_logger
 from shared.config import get_config
+from shared.utils import parse_dates
 
 logger = get_logger(__name__)
 config = get_config()
@@ -47,8 +48,7 @@ def _load_dataset() -> Tuple[pd.DataFrame, Dict[str, str]]:
         # Normalize data types
         df[store_col] = df[store_col].astype(str)
         df[sku_col] = df[sku_col].astype(str)
-        if df[date_col].dtype == 'object':
-            df[date_col] = pd.to_datetime(df[date_col])
+        df[date_col] = parse_dates(df[date_col])
         
         # Ensure date column is date type
         if pd.api.types.is_datetime64_any_dtype(df[date_col]):
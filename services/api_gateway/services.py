@@ -16,6 +16,7 @@ from services.ingestion.datasets import load_freshretailnet_dataset
 from shared.config import get_config
 from shared.logging_setup import get_logger
 from shared.column_mappings import COLUMN_MAPPINGS
+from shared.utils import parse_dates
 from services.forecasting.features.feature_engineering import create_forecast_features
 
 logger = get_logger(__name__)
@@ -63,8 +64,7 @@ def load_mvp_data() -> Tuple[pd.DataFrame, str, str, str, str]:
     # Normalize data types
     df[store_col] = df[store_col].astype(str)
     df[sku_col] = df[sku_col].astype(str)
-    if df[date_col].dtype == 'object':
-        df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_dates(df[date_col])
     df = df.sort_values([store_col, sku_col, date_col]).reset_index(drop=True)
 
     return df, store_col, sku_col, date_col, sales_col
@@ -278,10 +278,14 @@ class ForecastingService:
         """Generate forecasts using a moving-average heuristic with external factors."""
         forecasts: List[Dict] = []
         last_date = pd.to_datetime(df_daily['date'].max())
-        working_df = df_daily[['date', 'demand']].copy()
+        # Predictions are appended to a plain list; only the moving-average
+        # window is turned back into a frame
+        demand_history = df_daily['demand'].tolist()
 
         for i in range(horizon_days):
-            base_demand = self._simple_forecast(working_df, horizon=i + 1)
+            base_demand = self._simple_forecast(
+                pd.DataFrame({'demand': demand_history[-7:]}), horizon=i + 1
+            )
             target_date = last_date + timedelta(days=i + 1)
             target_date_obj = target_date.date() if hasattr(target_date, 'date') else target_date
             
@@ -308,10 +312,7 @@ class ForecastingService:
                 forecast_item["lower_bound"] = max(0.0, pred_demand - 1.96 * std)
                 forecast_item["upper_bound"] = pred_demand + 1.96 * std
             forecasts.append(forecast_item)
-            working_df = pd.concat(
-                [working_df, pd.DataFrame({"date": [target_date], "demand": [pred_demand]})],
-                ignore_index=True
-            )
+            demand_history.append(pred_demand)
 
         return forecasts
 
@@ -330,11 +331,14 @@ class ForecastingService:
 
         store_value = df_daily[store_col].iloc[0]
         sku_value = df_daily[sku_col].iloc[0]
-        history = df_daily[[store_col, sku_col, 'date', 'demand']].copy().sort_values('date')
+        # History rows are appended to a list and the frame is built once per
+        # step, instead of concatenating onto the previous frame
+        history_records = df_daily[[store_col, sku_col, 'date', 'demand']].sort_values('date').to_dict('records')
+        last_date = pd.to_datetime(df_daily['date'].max())
         forecasts: List[Dict] = []
 
         for _ in range(horizon_days):
-            target_date = pd.to_datetime(history['date'].max()) + timedelta(days=1)
+            target_date = last_date + timedelta(days=1)
             target_date_obj = target_date.date()
             future_row = {
                 store_col: store_value,
@@ -342,9 +346,9 @@ class ForecastingService:
                 'date': target_date,
                 'demand': np.nan
             }
-            history = pd.concat([history, pd.DataFrame([future_row])], ignore_index=True)
+            history_records.append(future_row)
             features = create_forecast_features(
-                history.copy(),
+                pd.DataFrame(history_records),
                 date_col='date',
                 target_col='demand',
                 store_col=store_col,
@@ -356,7 +360,7 @@ class ForecastingService:
 
             future_features = future_features.tail(1)
             model_input = self._prepare_model_inputs(future_features)
-            base_pred = float(self.model.predict(model_input.values)[0])
+            base_pred = float(self.model.predict(model_input.to_numpy(dtype=np.float32))[0])
             
             # Get historical seasonal baseline
             seasonal = self._get_seasonal_baseline(
@@ -383,7 +387,8 @@ class ForecastingService:
                 forecast_entry["upper_bound"] = pred_value + 1.96 * std
 
             forecasts.append(forecast_entry)
-            history.loc[history['date'] == target_date, 'demand'] = pred_value
+            future_row['demand'] = pred_value
+            last_date = target_date
 
         return forecasts
 
@@ -96,7 +96,7 @@ class WeatherService:
         self.logger = get_logger(__name__)
         self._cache: Dict[str, Dict] = {}
         self._cache_expiry: Dict[str, datetime] = {}
-        self._cache_duration = timedelta(hours=1)  # Cache weather for 1 hour
+        self._cache_duration = timedelta(minutes=30)  # Cache weather for 30 minutes
     
     def _get_store_coordinates(self, store_id: str) -> tuple:
         """Get coordinates for a store."""
@@ -138,7 +138,7 @@ class WeatherService:
         Returns:
             Dict with weather data and demand impact factors
         """
-        cache_key = f"{store_id}_{target_date.isoformat()}"
+        cache_key = f"{store_id}_{target_date.isoformat()}_{days_ahead}"
         
         # Check cache
         if self._is_cache_valid(cache_key):
@@ -238,10 +238,14 @@ class WeatherService:
             
         except httpx.HTTPError as e:
             self.logger.error(f"HTTP error fetching weather: {e}")
-            return self._get_fallback_weather(store_id, target_date, days_ahead)
         except Exception as e:
             self.logger.error(f"Error fetching weather: {e}", exc_info=True)
-            return self._get_fallback_weather(store_id, target_date, days_ahead)
+        
+        # Serve the last fetched forecast, even if expired, before estimating
+        if cache_key in self._cache:
+            self.logger.warning(f"Serving stale weather for {cache_key}")
+            return self._cache[cache_key]
+        return self._get_fallback_weather(store_id, target_date, days_ahead)
     
     def get_weather_factor_for_date(
         self,
@@ -258,23 +262,59 @@ class WeatherService:
         Returns:
             Dict with weather factor and details
         """
-        forecast = self.get_weather_forecast(store_id, target_date, days_ahead=1)
+        return self.get_weather_factors_for_range(store_id, target_date, days=1)[0]
+    
+    def get_weather_factors_for_range(
+        self,
+        store_id: str,
+        start_date: date,
+        days: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the weather demand impact factors for a range of dates.
         
-        # Find the specific date in forecasts
-        for day_forecast in forecast.get("forecasts", []):
-            if day_forecast["date"] == target_date.isoformat():
-                return {
-                    "date": target_date.isoformat(),
-                    "weather": day_forecast["condition"],
-                    "temperature": day_forecast["temperature"]["mean"],
-                    "temperature_category": day_forecast["temperature"]["category"],
-                    "weather_factor": day_forecast["demand_impact"]["combined_factor"],
-                    "description": day_forecast["demand_impact"]["description"],
-                    "source": "Open-Meteo API"
-                }
+        Fetches one forecast covering the whole range instead of one per date.
+        
+        Args:
+            store_id: Store identifier
+            start_date: First date of the range
+            days: Number of days
+            
+        Returns:
+            List of weather factor dicts, one per date
+        """
+        today = date.today()
+        end_date = start_date + timedelta(days=days - 1)
+        forecast = self.get_weather_forecast(
+            store_id, today, days_ahead=max((end_date - today).days, 1)
+        )
+        forecasts_by_date = {f["date"]: f for f in forecast.get("forecasts", [])}
+        is_fallback = forecast.get("is_fallback", False)
+        
+        factors = []
+        for i in range(days):
+            target_date = start_date + timedelta(days=i)
+            day_forecast = forecasts_by_date.get(target_date.isoformat())
+            if day_forecast is None:
+                # Date not covered by the forecast, use a seasonal estimate
+                factors.append({
+                    **self._get_fallback_weather_factor(target_date),
+                    "is_fallback": is_fallback
+                })
+                continue
+            
+            factors.append({
+                "date": target_date.isoformat(),
+                "weather": day_forecast["condition"],
+                "temperature": day_forecast["temperature"]["mean"],
+                "temperature_category": day_forecast["temperature"]["category"],
+                "weather_factor": day_forecast["demand_impact"]["combined_factor"],
+                "description": day_forecast["demand_impact"]["description"],
+                "source": "Open-Meteo API",
+                "is_fallback": is_fallback
+            })
         
-        # Date not found in forecast, use today's data or fallback
-        return self._get_fallback_weather_factor(target_date)
+        return factors
     
     def _get_fallback_weather(
         self,
@@ -335,7 +375,8 @@ class WeatherService:
             "timezone": "UTC",
             "generated_at": datetime.now().isoformat(),
             "forecasts": forecasts,
-            "source": "Fallback estimate (API unavailable)"
+            "source": "Fallback estimate (API unavailable)",
+            "is_fallback": True
         }
     
     def _get_fallback_weather_factor(self, target_date: date) -> Dict[str, Any]:
@@ -3,11 +3,21 @@
 from typing import List, Optional
 
 import pandas as pd
+import polars as pl
 
 from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Polars expressions for the supported aggregation functions
+_AGG_FUNCS = {
+    'sum': lambda col: col.sum(),
+    'mean': lambda col: col.mean(),
+    'max': lambda col: col.max(),
+    'min': lambda col: col.min(),
+    'count': lambda col: col.count().cast(pl.Int64),
+}
+
 
 def aggregate_to_daily(
     df: pd.DataFrame,
@@ -33,38 +43,32 @@ def aggregate_to_daily(
     if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
         df[date_col] = pd.to_datetime(df[date_col])
     
-    # Extract date (remove time component)
-    df = df.copy()
-    df['_date'] = df[date_col].dt.date
-    df['_date'] = pd.to_datetime(df['_date'])
-    
     # Determine grouping columns
     if group_cols is None:
         group_cols = []
     
-    grouping_cols = group_cols + ['_date']
-    
     # Validate columns exist
-    missing_cols = [col for col in grouping_cols + [value_col] if col not in df.columns]
+    missing_cols = [col for col in group_cols + [value_col] if col not in df.columns]
     if missing_cols:
         raise ValueError(f"Columns not found in DataFrame: {missing_cols}")
     
-    # Aggregate
-    if agg_func == 'sum':
-        result = df.groupby(grouping_cols)[value_col].sum().reset_index()
-    elif agg_func == 'mean':
-        result = df.groupby(grouping_cols)[value_col].mean().reset_index()
-    elif agg_func == 'max':
-        result = df.groupby(grouping_cols)[value_col].max().reset_index()
-    elif agg_func == 'min':
-        result = df.groupby(grouping_cols)[value_col].min().reset_index()
-    elif agg_func == 'count':
-        result = df.groupby(grouping_cols)[value_col].count().reset_index()
-    else:
+    if agg_func not in _AGG_FUNCS:
         raise ValueError(f"Unsupported aggregation function: {agg_func}")
     
-    # Rename date column back
-    result = result.rename(columns={'_date': date_col})
+    # Aggregate with polars on just the needed columns, truncating timestamps
+    # to midnight; null keys are dropped and keys sorted, as in pandas groupby
+    grouping_cols = group_cols + [date_col]
+    result = (
+        pl.from_pandas(df[grouping_cols + [value_col]])
+        .lazy()
+        .with_columns(pl.col(date_col).dt.truncate('1d'))
+        .drop_nulls(grouping_cols)
+        .group_by(grouping_cols)
+        .agg(_AGG_FUNCS[agg_func](pl.col(value_col)))
+        .sort(grouping_cols)
+        .collect()
+        .to_pandas()
+    )
     
     logger.info(
         "Aggregated to daily level",
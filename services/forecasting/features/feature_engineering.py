@@ -96,23 +96,23 @@ def create_forecast_features(
         if weather_col in df.columns:
             logger.info("Adding weather features")
             # Temperature features
-            df[f'{weather_col}_lag_1'] = df.groupby([store_col, sku_col])[weather_col].shift(1)
-            df[f'{weather_col}_rolling_mean_7'] = df.groupby([store_col, sku_col])[weather_col].transform(
+            df[f'{weather_col}_lag_1'] = df.groupby([store_col, sku_col], observed=True)[weather_col].shift(1)
+            df[f'{weather_col}_rolling_mean_7'] = df.groupby([store_col, sku_col], observed=True)[weather_col].transform(
                 lambda x: x.rolling(7, min_periods=1).mean()
             )
             
             # Additional weather columns if available
             for col in ['precpt', 'avg_humidity', 'avg_wind_level']:
                 if col in df.columns:
-                    df[f'{col}_lag_1'] = df.groupby([store_col, sku_col])[col].shift(1)
+                    df[f'{col}_lag_1'] = df.groupby([store_col, sku_col], observed=True)[col].shift(1)
 
     # Promotion features (if available)
     if include_promo:
         promo_col = COLUMN_MAPPINGS.get('promo_col', 'discount')
         if promo_col in df.columns:
             logger.info("Adding promotion features")
-            df[f'{promo_col}_lag_1'] = df.groupby([store_col, sku_col])[promo_col].shift(1)
-            df[f'{promo_col}_rolling_mean_7'] = df.groupby([store_col, sku_col])[promo_col].transform(
+            df[f'{promo_col}_lag_1'] = df.groupby([store_col, sku_col], observed=True)[promo_col].shift(1)
+            df[f'{promo_col}_rolling_mean_7'] = df.groupby([store_col, sku_col], observed=True)[promo_col].transform(
                 lambda x: x.rolling(7, min_periods=1).mean()
             )
             
@@ -122,7 +122,7 @@ def create_forecast_features(
     # Holiday and activity flags (if available)
     for flag_col in ['holiday_flag', 'activity_flag']:
         if flag_col in df.columns:
-            df[f'{flag_col}_lag_1'] = df.groupby([store_col, sku_col])[flag_col].shift(1)
+            df[f'{flag_col}_lag_1'] = df.groupby([store_col, sku_col], observed=True)[flag_col].shift(1)
 
     # Store and SKU encoding (categorical features)
     df[f'{store_col}_encoded'] = pd.Categorical(df[store_col]).codes
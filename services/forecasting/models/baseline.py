@@ -197,10 +197,7 @@ class SeasonalNaiveForecaster(BaseForecastModel):
             raise ValueError("Model has no stored seasonal values")
 
         # Generate forecasts by cycling through seasonal pattern
-        forecasts = []
-        for i in range(horizon):
-            idx = i % len(self.seasonal_values)
-            forecasts.append(self.seasonal_values[idx])
+        forecasts = np.resize(np.asarray(self.seasonal_values), horizon)
         
         # Create result DataFrame
         result = pd.DataFrame({
@@ -56,6 +56,11 @@ class LightGBMForecaster(BaseForecastModel):
             'force_col_wise': True
         }
 
+    @staticmethod
+    def _feature_matrix(data: pd.DataFrame, feature_cols: List[str]) -> np.ndarray:
+        """Convert feature columns to a float32 matrix with missing values as 0."""
+        return data[feature_cols].to_numpy(dtype=np.float32, na_value=0)
+
     def train(
         self,
         train_data: pd.DataFrame,
@@ -84,24 +89,27 @@ class LightGBMForecaster(BaseForecastModel):
         
         self.feature_cols = feature_cols
 
-        # Prepare training data
-        X_train = train_data[feature_cols].copy()
-        y_train = train_data[target_col].copy()
-
-        # Handle missing values
-        X_train = X_train.fillna(0)
+        # Prepare training data as contiguous float32 matrices, which LightGBM
+        # bins directly; free_raw_data drops them once binning is done
+        X_train = self._feature_matrix(train_data, feature_cols)
+        y_train = train_data[target_col].to_numpy(dtype=np.float32)
 
         # Create LightGBM dataset
-        train_dataset = lgb.Dataset(X_train, label=y_train)
+        train_dataset = lgb.Dataset(
+            X_train, label=y_train, feature_name=feature_cols, free_raw_data=True
+        )
 
         # Prepare validation data if provided
         valid_sets = [train_dataset]
         valid_names = ['train']
         
         if val_data is not None:
-            X_val = val_data[feature_cols].copy().fillna(0)
-            y_val = val_data[target_col].copy()
-            val_dataset = lgb.Dataset(X_val, label=y_val, reference=train_dataset)
+            X_val = self._feature_matrix(val_data, feature_cols)
+            y_val = val_data[target_col].to_numpy(dtype=np.float32)
+            val_dataset = lgb.Dataset(
+                X_val, label=y_val, feature_name=feature_cols,
+                reference=train_dataset, free_raw_data=True
+            )
             valid_sets.append(val_dataset)
             valid_names.append('valid')
 
@@ -159,8 +167,8 @@ class LightGBMForecaster(BaseForecastModel):
         if feature_cols is None:
             raise ValueError("Feature columns must be specified")
 
-        # Prepare features
-        X = data[feature_cols].copy().fillna(0)
+        # Prepare features (float32, as used for training)
+        X = self._feature_matrix(data, feature_cols)
 
         # Generate predictions
         predictions = self.model.predict(X, num_iteration=self.model.best_iteration)
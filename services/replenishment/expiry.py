@@ -1,6 +1,8 @@
 """Shelf-life and expiry modeling for inventory management."""
 
-from typing import List, Dict, Optional
+from bisect import insort
+from collections import deque
+from typing import Deque, List, Dict, Optional
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -15,6 +17,8 @@ logger = get_logger(__name__)
 class ExpiryBucket:
     """Represents inventory by expiry date bucket."""
 
+    __slots__ = ('expiry_date', 'expiry_ordinal', 'quantity')
+
     def __init__(self, expiry_date: datetime, quantity: float):
         """
         Initialize expiry bucket.
@@ -23,18 +27,26 @@ class ExpiryBucket:
             expiry_date: Date when inventory expires
             quantity: Quantity of units in this bucket
         """
+        self.reset(expiry_date, quantity)
+
+    def reset(self, expiry_date: datetime, quantity: float):
+        """Reinitialize the bucket so it can be reused."""
         self.expiry_date = expiry_date
+        self.expiry_ordinal = expiry_date.toordinal()
         self.quantity = quantity
-        self.days_until_expiry = None
-
-    def update_days_until_expiry(self, current_date: datetime):
-        """Update days until expiry based on current date."""
-        delta = self.expiry_date - current_date
-        self.days_until_expiry = max(0, delta.days)
 
 
 class InventoryAgeTracker:
-    """Track inventory by age/expiry buckets."""
+    """Track inventory by age/expiry buckets.
+
+    Buckets are kept sorted by expiry date, so the soonest-expiring
+    inventory is always at the front. Days until expiry are computed from
+    ``current_date`` on demand, so advancing the date is a single assignment.
+    Expired buckets are recycled through a shared free list rather than
+    allocated anew for every receipt.
+    """
+
+    _free_buckets: List[ExpiryBucket] = []
 
     def __init__(self, current_date: datetime):
         """
@@ -44,7 +56,21 @@ class InventoryAgeTracker:
             current_date: Current date for calculations
         """
         self.current_date = current_date
-        self.buckets: List[ExpiryBucket] = []
+        self.buckets: Deque[ExpiryBucket] = deque()
+
+    @property
+    def current_date(self) -> datetime:
+        """Current date for calculations."""
+        return self._current_date
+
+    @current_date.setter
+    def current_date(self, value: datetime):
+        self._current_date = value
+        self._current_ordinal = value.toordinal()
+
+    def days_until_expiry(self, bucket: ExpiryBucket) -> int:
+        """Calendar days until a bucket expires as of the current date (0 if expired)."""
+        return max(0, bucket.expiry_ordinal - self._current_ordinal)
 
     def add_inventory(
         self,
@@ -60,9 +86,26 @@ class InventoryAgeTracker:
             expiry_date: Date when units expire
             receipt_date: Date when units were received (optional)
         """
-        bucket = ExpiryBucket(expiry_date, quantity)
-        bucket.update_days_until_expiry(self.current_date)
-        self.buckets.append(bucket)
+        if self._free_buckets:
+            bucket = self._free_buckets.pop()
+            bucket.reset(expiry_date, quantity)
+        else:
+            bucket = ExpiryBucket(expiry_date, quantity)
+        insort(self.buckets, bucket, key=lambda b: b.expiry_date)
+
+    def remove_expired(self) -> List[float]:
+        """
+        Remove buckets that have expired as of the current date.
+
+        Returns:
+            Quantities of the removed buckets, soonest expiry first
+        """
+        expired = []
+        while self.buckets and self.buckets[0].expiry_ordinal <= self._current_ordinal:
+            bucket = self.buckets.popleft()
+            expired.append(bucket.quantity)
+            self._free_buckets.append(bucket)
+        return expired
 
     def get_expiring_units(self, days_ahead: int) -> float:
         """
@@ -76,11 +119,21 @@ class InventoryAgeTracker:
         """
         total = 0.0
         for bucket in self.buckets:
-            if bucket.days_until_expiry is not None:
-                if 0 <= bucket.days_until_expiry <= days_ahead:
-                    total += bucket.quantity
+            if self.days_until_expiry(bucket) <= days_ahead:
+                total += bucket.quantity
         return total
 
+    def get_nearest_expiry_days(self) -> Optional[int]:
+        """
+        Get days until the soonest-expiring bucket expires.
+
+        Returns:
+            Days until expiry of the first bucket, or None if there is no inventory
+        """
+        if not self.buckets:
+            return None
+        return self.days_until_expiry(self.buckets[0])
+
     def get_total_inventory(self) -> float:
         """Get total inventory across all buckets."""
         return sum(bucket.quantity for bucket in self.buckets)
@@ -94,9 +147,8 @@ class InventoryAgeTracker:
         """
         result = {}
         for bucket in self.buckets:
-            if bucket.days_until_expiry is not None:
-                days = bucket.days_until_expiry
-                result[days] = result.get(days, 0.0) + bucket.quantity
+            days = self.days_until_expiry(bucket)
+            result[days] = result.get(days, 0.0) + bucket.quantity
         return result
 
     def get_max_sellable_before_expiry(
@@ -119,12 +171,11 @@ class InventoryAgeTracker:
         # Calculate demand capacity based on expiry buckets
         demand_capacity = 0.0
         for bucket in self.buckets:
-            if bucket.days_until_expiry is not None:
-                days_available = min(bucket.days_until_expiry, coverage_days)
-                if days_available > 0:
-                    # Can sell min of bucket quantity and demand capacity
-                    bucket_demand_capacity = forecasted_daily_demand * days_available
-                    demand_capacity += min(bucket.quantity, bucket_demand_capacity)
+            days_available = min(self.days_until_expiry(bucket), coverage_days)
+            if days_available > 0:
+                # Can sell min of bucket quantity and demand capacity
+                bucket_demand_capacity = forecasted_daily_demand * days_available
+                demand_capacity += min(bucket.quantity, bucket_demand_capacity)
         
         # Maximum sellable is limited by both total inventory and demand capacity
         max_sellable = min(total_inventory, demand_capacity)
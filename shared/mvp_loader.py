@@ -0,0 +1,140 @@
+"""Loading of the MVP store selection written by select_mvp_subset."""
+
+import re
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from shared.config import get_config
+
+# File name of the cached MVP subset data, kept next to the selection file
+MVP_DATA_CACHE_NAME = "mvp_subset_data.parquet"
+
+# Parquet metadata key recording which dataset the cached MVP data came from
+_FINGERPRINT_KEY = b"mvp_dataset_fingerprint"
+
+# Extensions of dataset files whose changes invalidate the cache
+_DATASET_SUFFIXES = {".parquet", ".arrow", ".csv"}
+
+# A store ID on its own line, as written under "Selected Stores"
+_STORE_LINE = re.compile(r"^\s*(-?\d+)\s*$", re.MULTILINE)
+
+
+def get_mvp_file() -> Path:
+    """Get the default path of the MVP selection file."""
+    config = get_config()
+    return Path(config.data.processed_path) / "mvp_selection" / "mvp_subset.txt"
+
+
+def get_dataset_fingerprint() -> str:
+    """
+    Identify the dataset that MVP data is filtered from.
+
+    Combines the configured dataset name and data directories with the latest
+    modification time of the dataset files in them, so switching config or
+    refreshing the dataset changes the fingerprint.
+    """
+    config = get_config()
+    parts = [config.data.hf_dataset_name]
+    latest_mtime = 0.0
+    for directory in (config.data.dataset_path, config.data.hf_cache_dir):
+        directory = Path(directory).resolve()
+        parts.append(str(directory))
+        if directory.is_dir():
+            for path in directory.rglob("*"):
+                if path.suffix in _DATASET_SUFFIXES and path.is_file():
+                    latest_mtime = max(latest_mtime, path.stat().st_mtime)
+    parts.append(str(latest_mtime))
+    return "|".join(parts)
+
+
+def load_mvp_stores(mvp_file: Optional[Path] = None) -> List[int]:
+    """
+    Load the selected MVP store IDs.
+
+    Args:
+        mvp_file: Path of the selection file (defaults to get_mvp_file())
+
+    Returns:
+        Store IDs listed under "Selected Stores", or an empty list if the
+        file does not exist or lists no stores
+    """
+    mvp_file = Path(mvp_file) if mvp_file is not None else get_mvp_file()
+    if not mvp_file.exists():
+        return []
+
+    text = mvp_file.read_text(encoding='utf-8')
+    if "Selected Stores" not in text:
+        return []
+
+    # Stores are listed between the "Selected Stores (N):" header line and
+    # the "Selected SKUs" line
+    stores_section = text.split("Selected Stores", 1)[1].split("Selected SKUs", 1)[0]
+    stores_section = stores_section.partition("\n")[2]
+
+    return [int(store) for store in _STORE_LINE.findall(stores_section)]
+
+
+def load_cached_mvp_data(
+    mvp_file: Optional[Path] = None,
+    dataset_fingerprint: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load the MVP subset data cached by save_mvp_data_cache.
+
+    Args:
+        mvp_file: Path of the selection file (defaults to get_mvp_file())
+        dataset_fingerprint: Fingerprint of the current dataset (defaults to
+            get_dataset_fingerprint())
+
+    Returns:
+        The cached DataFrame, or None if there is no cache, it is older than
+        the selection file or it was filtered from a different dataset
+    """
+    mvp_file = Path(mvp_file) if mvp_file is not None else get_mvp_file()
+    cache_file = mvp_file.with_name(MVP_DATA_CACHE_NAME)
+    if not mvp_file.exists() or not cache_file.exists():
+        return None
+    if cache_file.stat().st_mtime <= mvp_file.stat().st_mtime:
+        return None
+
+    if dataset_fingerprint is None:
+        dataset_fingerprint = get_dataset_fingerprint()
+    metadata = pq.read_schema(cache_file).metadata or {}
+    if metadata.get(_FINGERPRINT_KEY) != dataset_fingerprint.encode():
+        return None
+
+    return pd.read_parquet(cache_file)
+
+
+def save_mvp_data_cache(
+    df: pd.DataFrame,
+    mvp_file: Optional[Path] = None,
+    dataset_fingerprint: Optional[str] = None
+) -> Path:
+    """
+    Cache the filtered MVP subset data next to the selection file.
+
+    Args:
+        df: Filtered MVP data, with dates already parsed
+        mvp_file: Path of the selection file (defaults to get_mvp_file())
+        dataset_fingerprint: Fingerprint of the dataset the data was filtered
+            from (defaults to get_dataset_fingerprint())
+
+    Returns:
+        Path of the cache file
+    """
+    mvp_file = Path(mvp_file) if mvp_file is not None else get_mvp_file()
+    cache_file = mvp_file.with_name(MVP_DATA_CACHE_NAME)
+    if dataset_fingerprint is None:
+        dataset_fingerprint = get_dataset_fingerprint()
+
+    # Record the source dataset in the Parquet metadata so a cache built
+    # from another config or an older dataset is not reused
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), _FINGERPRINT_KEY: dataset_fingerprint.encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), cache_file, compression='zstd')
+    return cache_file
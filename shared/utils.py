@@ -9,6 +9,9 @@ from shared.logging_setup import get_logger
 
 logger = get_logger(__name__)
 
+# Format of the date strings in the FreshRetailNet dataset
+DATASET_DATE_FORMAT = '%Y-%m-%d'
+
 
 def create_date_range(start_date: str | datetime, end_date: str | datetime, freq: str = 'D') -> pd.DatetimeIndex:
     """
@@ -30,6 +33,24 @@ def create_date_range(start_date: str | datetime, end_date: str | datetime, freq
     return pd.date_range(start=start_date, end=end_date, freq=freq)
 
 
+def parse_dates(values: pd.Series, date_format: str = DATASET_DATE_FORMAT) -> pd.Series:
+    """
+    Parse a date column, leaving columns that are already datetime untouched.
+
+    Args:
+        values: Date column (strings or datetime)
+        date_format: Format of the date strings
+
+    Returns:
+        Datetime Series
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    # An explicit format skips inference; cache parses each unique day once
+    return pd.to_datetime(values, format=date_format, cache=True)
+
+
 def add_calendar_features(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
     """
     Add calendar features to a DataFrame.
@@ -103,7 +124,7 @@ def add_lag_features(
     # Create lag features
     for lag in lags:
         if group_cols:
-            df[f'{value_col}_lag_{lag}'] = df.groupby(group_cols)[value_col].shift(lag)
+            df[f'{value_col}_lag_{lag}'] = df.groupby(group_cols, observed=True)[value_col].shift(lag)
         else:
             df[f'{value_col}_lag_{lag}'] = df[value_col].shift(lag)
     
@@ -144,7 +165,7 @@ def add_rolling_features(
     # Create rolling features
     for window in windows:
         if group_cols:
-            grouped = df.groupby(group_cols)[value_col]
+            grouped = df.groupby(group_cols, observed=True)[value_col]
         else:
             grouped = df[value_col]
         
@@ -1,10 +1,14 @@
 """Unit tests for API gateway services."""
 
+import httpx
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import date, timedelta
 
 from services.api_gateway.services import ForecastingService, ReplenishmentService
+from services.api_gateway.demand_factors_service import DemandFactorsService
+from services.api_gateway.holiday_service import HolidayService
+from services.api_gateway.weather_service import WeatherService
 
 
 class TestForecastingService:
@@ -58,3 +62,100 @@ class TestReplenishmentService:
             assert isinstance(rec["order_quantity"], (int, float))
             assert rec["order_quantity"] >= 0
 
+
+class TestDemandFactorsService:
+    """Test demand factors service."""
+    
+    def test_holidays_response_is_cached(self):
+        """Test upcoming holidays are fetched once and reused."""
+        service = DemandFactorsService()
+        service.holiday_service = Mock()
+        service.holiday_service.get_upcoming_holidays.return_value = [{"name": "New Year"}]
+        
+        first = service.get_upcoming_holidays("235", 30)
+        second = service.get_upcoming_holidays("235", 30)
+        
+        assert first == second == [{"name": "New Year"}]
+        service.holiday_service.get_upcoming_holidays.assert_called_once_with("235", 30)
+    
+    def test_fallback_holidays_not_cached(self):
+        """Test holidays estimated during an API outage are refetched once it recovers."""
+        service = DemandFactorsService()
+        service.holiday_service = HolidayService()
+        client = _FlakyClient(down=True)
+        
+        with patch('services.api_gateway.holiday_service.httpx.Client', return_value=client):
+            service.get_upcoming_holidays("235", 30)
+            client.down = False
+            holidays = service.get_upcoming_holidays("235", 30)
+        
+        assert client.calls == 2
+        assert "Test Day" in [h["name"] for h in holidays]
+    
+    def test_stale_holidays_served_on_failure(self):
+        """Test the last fetched holidays are served when the API fails."""
+        service = DemandFactorsService()
+        service.holiday_service = HolidayService()
+        client = _FlakyClient(down=False)
+        
+        with patch('services.api_gateway.holiday_service.httpx.Client', return_value=client):
+            first = service.get_upcoming_holidays("235", 30)
+            
+            # Expire every cached copy and take the API down
+            service._response_cache_expiry.clear()
+            service.holiday_service._cache_expiry.clear()
+            client.down = True
+            
+            assert service.get_upcoming_holidays("235", 30) == first
+    
+    def test_stale_weather_served_on_failure(self):
+        """Test the last fetched forecast is served when the API fails."""
+        weather_service = WeatherService()
+        client = _FlakyClient(down=False)
+        
+        with patch('services.api_gateway.weather_service.httpx.Client', return_value=client):
+            first = weather_service.get_weather_forecast("235", date.today(), 3)
+            weather_service._cache_expiry.clear()
+            client.down = True
+            
+            assert weather_service.get_weather_forecast("235", date.today(), 3) == first
+        assert "is_fallback" not in first
+
+
+class _FlakyClient:
+    """Stand-in for httpx.Client whose requests fail while the API is down."""
+    
+    def __init__(self, down: bool):
+        self.down = down
+        self.calls = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+    
+    def get(self, url, params=None):
+        self.calls += 1
+        if self.down:
+            raise httpx.ConnectError("API down")
+        
+        response = Mock()
+        today = date.today()
+        if params is not None:
+            # Open-Meteo daily forecast
+            days = params["forecast_days"]
+            daily = {variable: [0.0] * days for variable in params["daily"]}
+            daily["time"] = [(today + timedelta(days=i)).isoformat() for i in range(days)]
+            response.json.return_value = {
+                "daily": daily,
+                "timezone": "UTC",
+            }
+        else:
+            # Nager.Date public holidays
+            response.json.return_value = [{
+                "date": (today + timedelta(days=5)).isoformat(),
+                "localName": "Test Day",
+                "countryCode": "US",
+            }]
+        return response
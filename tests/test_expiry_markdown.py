@@ -24,25 +24,19 @@ class TestExpiryBucket:
         assert bucket.expiry_date == expiry_date
         assert bucket.quantity == 50.0
 
-    def test_update_days_until_expiry(self):
-        """Test updating days until expiry."""
-        expiry_date = datetime(2024, 6, 15)
-        current_date = datetime(2024, 6, 10)
-        
-        bucket = ExpiryBucket(expiry_date, 50.0)
-        bucket.update_days_until_expiry(current_date)
+    def test_days_until_expiry(self):
+        """Test days until expiry as of the tracker's current date."""
+        tracker = InventoryAgeTracker(datetime(2024, 6, 10))
+        bucket = ExpiryBucket(datetime(2024, 6, 15), 50.0)
         
-        assert bucket.days_until_expiry == 5
+        assert tracker.days_until_expiry(bucket) == 5
 
     def test_expired_inventory(self):
         """Test handling expired inventory."""
-        expiry_date = datetime(2024, 6, 10)
-        current_date = datetime(2024, 6, 15)
+        tracker = InventoryAgeTracker(datetime(2024, 6, 15))
+        bucket = ExpiryBucket(datetime(2024, 6, 10), 50.0)
         
-        bucket = ExpiryBucket(expiry_date, 50.0)
-        bucket.update_days_until_expiry(current_date)
-        
-        assert bucket.days_until_expiry == 0
+        assert tracker.days_until_expiry(bucket) == 0
 
 
 class TestInventoryAgeTracker:
@@ -58,7 +52,7 @@ class TestInventoryAgeTracker:
         
         assert len(tracker.buckets) == 1
         assert tracker.buckets[0].quantity == 50.0
-        assert tracker.buckets[0].days_until_expiry == 5
+        assert tracker.days_until_expiry(tracker.buckets[0]) == 5
 
     def test_get_expiring_units(self):
         """Test getting expiring units."""
@@ -74,6 +68,65 @@ class TestInventoryAgeTracker:
         expiring = tracker.get_expiring_units(3)
         assert expiring == 20.0  # Only the 2-day bucket
 
+    def test_expiring_units_follow_current_date(self):
+        """Test days until expiry track the tracker's current date."""
+        tracker = InventoryAgeTracker(datetime(2024, 6, 10))
+        tracker.add_inventory(30.0, datetime(2024, 6, 15))
+        
+        assert tracker.get_expiring_units(3) == 0.0
+        
+        tracker.current_date = datetime(2024, 6, 13)
+        assert tracker.days_until_expiry(tracker.buckets[0]) == 2
+        assert tracker.get_expiring_units(3) == 30.0
+
+    def test_buckets_sorted_by_expiry(self):
+        """Test buckets are kept in expiry order regardless of insertion order."""
+        current_date = datetime(2024, 6, 10)
+        tracker = InventoryAgeTracker(current_date)
+        
+        tracker.add_inventory(50.0, datetime(2024, 6, 20))
+        tracker.add_inventory(20.0, datetime(2024, 6, 12))
+        tracker.add_inventory(30.0, datetime(2024, 6, 15))
+        
+        assert [b.quantity for b in tracker.buckets] == [20.0, 30.0, 50.0]
+
+    def test_nearest_expiry_days(self):
+        """Test nearest expiry comes from the soonest-expiring bucket."""
+        tracker = InventoryAgeTracker(datetime(2024, 6, 10))
+        assert tracker.get_nearest_expiry_days() is None
+        
+        tracker.add_inventory(50.0, datetime(2024, 6, 20))
+        tracker.add_inventory(20.0, datetime(2024, 6, 12))
+        
+        assert tracker.get_nearest_expiry_days() == 2
+
+    def test_remove_expired(self):
+        """Test removing expired buckets."""
+        current_date = datetime(2024, 6, 10)
+        tracker = InventoryAgeTracker(current_date)
+        
+        tracker.add_inventory(20.0, datetime(2024, 6, 12))
+        tracker.add_inventory(30.0, datetime(2024, 6, 15))
+        
+        assert tracker.remove_expired() == []
+        
+        tracker.current_date = datetime(2024, 6, 12)
+        assert tracker.remove_expired() == [20.0]
+        assert tracker.get_total_inventory() == 30.0
+
+    def test_expired_buckets_are_reused(self):
+        """Test buckets freed by expiry are recycled for new inventory."""
+        tracker = InventoryAgeTracker(datetime(2024, 6, 10))
+        tracker.add_inventory(20.0, datetime(2024, 6, 10))
+        expired_bucket = tracker.buckets[0]
+        tracker.remove_expired()
+        
+        tracker.add_inventory(40.0, datetime(2024, 6, 14))
+        
+        assert tracker.buckets[0] is expired_bucket
+        assert tracker.buckets[0].quantity == 40.0
+        assert tracker.days_until_expiry(tracker.buckets[0]) == 4
+
     def test_get_total_inventory(self):
         """Test getting total inventory."""
         current_date = datetime(2024, 6, 10)
@@ -0,0 +1,53 @@
+"""Tests for MVP store selection loading."""
+
+import os
+
+import pandas as pd
+
+from shared.mvp_loader import load_cached_mvp_data, load_mvp_stores, save_mvp_data_cache
+
+
+def test_load_mvp_stores(tmp_path):
+    """Test parsing the stores section of a selection file."""
+    mvp_file = tmp_path / "mvp_subset.txt"
+    mvp_file.write_text(
+        "MVP Subset Selection\n"
+        + "=" * 80 + "\n\n"
+        "Selected Stores (3):\n"
+        "  235\n"
+        "  17\n"
+        "  4\n"
+        "\nSelected SKUs: 120\n"
+        "\nTotal Records: 5000\n"
+    )
+
+    assert load_mvp_stores(mvp_file) == [235, 17, 4]
+
+
+def test_load_mvp_stores_missing_file(tmp_path):
+    """Test that a missing selection file yields no stores."""
+    assert load_mvp_stores(tmp_path / "missing.txt") == []
+
+
+def test_mvp_data_cache(tmp_path):
+    """Test that cached MVP data is reused until the selection changes."""
+    mvp_file = tmp_path / "mvp_subset.txt"
+    mvp_file.write_text("Selected Stores (1):\n  235\n\nSelected SKUs: 1\n")
+    df = pd.DataFrame({
+        'store_id': [235, 235],
+        'dt': pd.to_datetime(['2024-01-01', '2024-01-02']),
+        'sale_amount': [1.5, 2.0],
+    })
+
+    assert load_cached_mvp_data(mvp_file, "data/raw") is None
+
+    cache_file = save_mvp_data_cache(df, mvp_file, "data/raw")
+    os.utime(mvp_file, (0, 0))
+    pd.testing.assert_frame_equal(load_cached_mvp_data(mvp_file, "data/raw"), df)
+
+    # Data filtered from another dataset is not reused
+    assert load_cached_mvp_data(mvp_file, "data/raw_dev") is None
+
+    # A newer selection file invalidates the cache
+    os.utime(cache_file, (0, 0))
+    assert load_cached_mvp_data(mvp_file, "data/raw") is None
@@ -8,6 +8,7 @@ from shared.utils import (
     add_calendar_features,
     add_lag_features,
     add_rolling_features,
+    parse_dates,
 )
 
 
@@ -19,6 +20,16 @@ def test_create_date_range():
     assert dates[-1] == pd.Timestamp('2024-01-05')
 
 
+def test_parse_dates():
+    """Test parsing dataset date strings."""
+    dates = parse_dates(pd.Series(['2024-01-01', '2024-01-02', '2024-01-01']))
+    assert pd.api.types.is_datetime64_any_dtype(dates)
+    assert dates.iloc[1] == pd.Timestamp('2024-01-02')
+
+    # Datetime columns are returned unchanged
+    assert parse_dates(dates) is dates
+
+
 def test_add_calendar_features():
     """Test calendar feature addition."""
     df = pd.DataFrame({